@@ -6,16 +6,19 @@ Serveur API pour les interactions externes avec l'assistant Angel.
 """
 
 import asyncio
+import hmac
 import logging
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Set, Union
 
+import ciso8601
+import msgspec
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, Query, Path, Body, Request, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Query, Path, Request, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from config.settings import Settings
 from events.event_manager import EventManager
@@ -23,52 +26,172 @@ from events.event_types import Event, EventType, EventPriority, IntrusiveEvents
 
 logger = logging.getLogger("angel.api")
 
-# Modèles de données pour l'API
-class EventData(BaseModel):
+# Tables de correspondance insensibles à la casse, pré-calculées à l'import
+# (évite .upper() + construction d'exception KeyError à chaque requête)
+_EVENT_TYPE_MAP = {name.lower(): member for name, member in EventType.__members__.items()}
+_PRIORITY_MAP = {name.lower(): member for name, member in EventPriority.__members__.items()}
+
+# Nom (en minuscules) de l'en-tête d'authentification dans scope["headers"]
+_AUTH_HEADER = b"authorization"
+
+# En-têtes CORS statiques (remplace CORSMiddleware, dont le coût par requête
+# est disproportionné pour une API interne à origine unique)
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "*",
+    "Access-Control-Allow-Headers": "*",
+}
+_CORS_RAW_HEADERS = [
+    (name.lower().encode("latin-1"), value.encode("latin-1"))
+    for name, value in _CORS_HEADERS.items()
+]
+
+# Table de répartition des événements intrusifs : nom (en minuscules) vers
+# (constructeur, plan d'arguments positionnels avec valeurs par défaut)
+_INTRUSIVE_DISPATCH = {
+    "whatsapp_call": (IntrusiveEvents.whatsapp_call, (("caller", "Inconnu"), ("video", False))),
+    "phone_call": (IntrusiveEvents.phone_call, (("caller", "Inconnu"),)),
+    "sms": (IntrusiveEvents.sms_received, (("sender", "Inconnu"), ("message", ""), ("urgent", False))),
+    "email": (IntrusiveEvents.email_received, (("sender", "Inconnu"), ("subject", ""), ("urgent", False))),
+    "weather_alert": (IntrusiveEvents.weather_alert, (("alert_type", "Alerte météo"), ("description", ""), ("severity", 1))),
+}
+
+# Horodatage courant partagé, rafraîchi en tâche de fond avec une granularité
+# d'environ 100 ms : une lecture de slot par requête au lieu d'une allocation
+# datetime.now() (la précision exacte n'a pas d'importance pour ces réponses)
+_NOW = [datetime.now()]
+
+
+async def _refresh_now():
+    """Rafraîchit périodiquement l'horodatage partagé _NOW"""
+    while True:
+        _NOW[0] = datetime.now()
+        await asyncio.sleep(0.1)
+
+# Modèles de données pour l'API (msgspec décode et valide le JSON en un seul
+# passage C, bien plus rapide que le pipeline de validation Pydantic)
+class EventData(msgspec.Struct):
     """Modèle pour les données d'événements"""
     event_type: str
-    priority: str = "MEDIUM"
     source: str
-    data: Dict[str, Any] = Field(default_factory=dict)
-    
-class ActivityData(BaseModel):
+    priority: str = "MEDIUM"
+    data: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+class ActivityData(msgspec.Struct):
     """Modèle pour les données d'activité"""
     activity_type: str
     description: str
     priority: str = "MEDIUM"
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
 
-class NotificationData(BaseModel):
+class NotificationData(msgspec.Struct):
     """Modèle pour les notifications"""
     title: str
     message: str
     priority: str = "MEDIUM"
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
+
+# Décodeurs msgspec pré-construits (un par modèle)
+_EVENT_DATA_DECODER = msgspec.json.Decoder(EventData)
+_ACTIVITY_DATA_DECODER = msgspec.json.Decoder(ActivityData)
+_NOTIFICATION_DATA_DECODER = msgspec.json.Decoder(NotificationData)
+
+
+async def _decode_body(request: Request, decoder: msgspec.json.Decoder):
+    """
+    Décode le corps JSON d'une requête avec un décodeur msgspec
+
+    Args:
+        request (Request): Requête HTTP entrante
+        decoder (msgspec.json.Decoder): Décodeur pré-construit pour le modèle attendu
+
+    Returns:
+        Instance du modèle décodé
+
+    Raises:
+        HTTPException: Si le corps de la requête est invalide
+    """
+    try:
+        return decoder.decode(await request.body())
+    except msgspec.ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Corps de requête invalide: {e}"
+        )
+    except msgspec.DecodeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"JSON invalide: {e}"
+        )
+
+# Enveloppe de succès commune aux routes de publication : la forme est fixe
+# et ses valeurs (id d'événement, horodatage ISO) n'ont pas besoin
+# d'échappement JSON, deux substitutions suffisent donc au lieu d'un passage
+# complet par l'encodeur
+_SUCCESS_TMPL = b'{"status":"success","event_id":"%s","timestamp":"%s"}'
+
+
+def _success_response(event: Event) -> Response:
+    """
+    Construit la réponse de succès commune aux routes de publication
+
+    Args:
+        event (Event): Événement publié
+
+    Returns:
+        Response: Réponse JSON 202 avec l'id et l'horodatage de l'événement
+    """
+    body = _SUCCESS_TMPL % (event.id.encode(), event.timestamp.isoformat().encode())
+    return Response(
+        content=body,
+        media_type="application/json",
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+# Réponse 401 pré-composée une seule fois pour le middleware d'authentification
+_401_BODY = orjson.dumps({"detail": "API key invalide ou manquante"})
+_401_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_401_BODY)).encode("latin-1")),
+]
 
-class ApiKeyAuth:
-    """Classe pour la vérification de la clé API"""
-    
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-    
-    async def __call__(self, request: Request):
-        if not self.api_key:
-            return True
-            
-        api_key = request.headers.get("Authorization")
-        if not api_key:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="API key manquante"
-            )
-        
-        if api_key != f"Bearer {self.api_key}":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="API key invalide"
-            )
-        
-        return True
+
+class AuthMiddleware:
+    """
+    Middleware ASGI pur pour la vérification de la clé API.
+
+    La vérification se fait avant la résolution des dépendances FastAPI,
+    ce qui évite de construire un graphe de dépendances par requête.
+    """
+
+    def __init__(self, app, api_key: str):
+        self.app = app
+        # Valeur attendue pré-calculée en bytes (comparable directement aux
+        # en-têtes bruts du scope ASGI, sans f-string ni décodage par requête)
+        self._expected = f"Bearer {api_key}".encode()
+
+    async def __call__(self, scope, receive, send):
+        # Les requêtes préliminaires CORS (OPTIONS) ne portent pas la clé API
+        if scope["type"] == "http" and scope["method"] != "OPTIONS":
+            # Parcourir scope["headers"] directement : évite l'allocation du
+            # wrapper Headers de Starlette et son .get() par requête
+            api_key = None
+            for name, value in scope["headers"]:
+                if name == _AUTH_HEADER:
+                    api_key = value
+                    break
+
+            # Comparaison en temps constant pour éviter les attaques par timing
+            if api_key is None or not hmac.compare_digest(api_key, self._expected):
+                await send({
+                    "type": "http.response.start",
+                    "status": status.HTTP_401_UNAUTHORIZED,
+                    "headers": _401_HEADERS
+                })
+                await send({"type": "http.response.body", "body": _401_BODY})
+                return
+
+        await self.app(scope, receive, send)
 
 class ApiServer:
     """
@@ -94,26 +217,39 @@ class ApiServer:
         self.app = FastAPI(
             title="Angel Interactive Assistant API",
             description="API pour interagir avec l'assistant Angel",
-            version="1.0.0"
+            version="1.0.0",
+            default_response_class=ORJSONResponse,
+            # Documentation interactive uniquement en mode debug
+            docs_url="/docs" if settings.debug else None,
+            redoc_url="/redoc" if settings.debug else None
         )
         
-        # Middleware CORS
-        self.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-        
-        # Authentification API
-        self.api_auth = ApiKeyAuth(settings.angel_server_key)
-        
+        # Compression gzip des grandes réponses JSON (/api/events, /api/config) ;
+        # le seuil évite de compresser les petites réponses de statut
+        self.app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+        # Authentification API via middleware ASGI pur ; non enregistré quand
+        # aucune clé n'est configurée, auquel cas aucun coût par requête
+        if settings.angel_server_key:
+            self.app.add_middleware(AuthMiddleware, api_key=settings.angel_server_key)
+
+        # Les paramètres sont immuables après le démarrage : sérialiser la
+        # configuration une seule fois plutôt qu'à chaque requête
+        self._config_payload = orjson.dumps(self._build_config_dict())
+
         # Définir les routes API
         self._setup_routes()
         
         # Serveur Uvicorn
         self.server = None
+
+        # Tâche de rafraîchissement de l'horodatage partagé
+        self._now_task = None
+
+        # File de publication en tâche de fond : la réponse HTTP n'attend pas
+        # le traitement des abonnés aux événements
+        self._publish_queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
+        self._publish_task = None
         
         logger.info(f"Serveur API initialisé sur {host}:{port}")
     
@@ -121,342 +257,363 @@ class ApiServer:
         """
         Configure les routes de l'API
         """
-        
+
+        @self.app.exception_handler(Exception)
+        async def handle_unexpected_error(request: Request, exc: Exception):
+            """
+            Gestionnaire centralisé des erreurs inattendues (remplace les
+            blocs try/except répétés dans chaque route)
+            """
+            logger.exception(f"Erreur interne sur {request.url.path}: {exc}")
+            return ORJSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": f"Erreur interne du serveur: {str(exc)}"}
+            )
+
+        @self.app.middleware("http")
+        async def add_cors_headers(request: Request, call_next):
+            """
+            Ajoute les en-têtes CORS statiques à chaque réponse
+            """
+            response = await call_next(request)
+            response.raw_headers.extend(_CORS_RAW_HEADERS)
+            return response
+
+        @self.app.options("/{path:path}", include_in_schema=False)
+        async def cors_preflight(path: str):
+            """
+            Répond aux requêtes préliminaires CORS (preflight)
+            """
+            return Response(status_code=status.HTTP_204_NO_CONTENT, headers=_CORS_HEADERS)
+
         @self.app.get("/api/status", tags=["Système"])
-        async def get_status(auth: bool = Depends(self.api_auth)):
+        async def get_status():
             """
             Obtient le statut actuel du système
             """
             return {
                 "status": "running",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _NOW[0],
                 "version": "1.0.0"
             }
         
-        @self.app.post("/api/events", tags=["Événements"])
-        async def create_event(event_data: EventData, auth: bool = Depends(self.api_auth)):
+        @self.app.post("/api/events", status_code=status.HTTP_202_ACCEPTED, tags=["Événements"])
+        async def create_event(request: Request):
             """
             Crée un nouvel événement dans le système
             """
-            try:
-                # Vérifier le type d'événement
-                try:
-                    event_type = EventType[event_data.event_type.upper()]
-                except KeyError:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Type d'événement non reconnu: {event_data.event_type}"
-                    )
-                
-                # Vérifier la priorité
-                try:
-                    priority = EventPriority[event_data.priority.upper()]
-                except KeyError:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Priorité non reconnue: {event_data.priority}"
-                    )
-                
-                # Créer l'événement
-                event = Event(
-                    event_type=event_type,
-                    priority=priority,
-                    source=event_data.source,
-                    data=event_data.data
+            event_data = await _decode_body(request, _EVENT_DATA_DECODER)
+
+            # Vérifier le type d'événement
+            event_type = _EVENT_TYPE_MAP.get(event_data.event_type.lower())
+            if event_type is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Type d'événement non reconnu: {event_data.event_type}"
                 )
-                
-                # Publier l'événement
-                await self.event_manager.publish(event)
-                
-                return {
-                    "status": "success",
-                    "event_id": event.id,
-                    "timestamp": event.timestamp.isoformat()
-                }
-            
-            except Exception as e:
-                logger.error(f"Erreur lors de la création de l'événement: {e}")
+
+            # Vérifier la priorité
+            priority = _PRIORITY_MAP.get(event_data.priority.lower())
+            if priority is None:
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erreur lors de la création de l'événement: {str(e)}"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Priorité non reconnue: {event_data.priority}"
                 )
+
+            # Créer l'événement
+            event = Event(
+                event_type=event_type,
+                priority=priority,
+                source=event_data.source,
+                data=event_data.data
+            )
+
+            # Publier l'événement en tâche de fond (la réponse n'attend pas
+            # le traitement des abonnés)
+            await self._publish_background(event)
+
+            return _success_response(event)
         
         @self.app.get("/api/events", tags=["Événements"])
         async def get_events(
             event_type: Optional[str] = None,
             priority: Optional[str] = None,
             since: Optional[str] = None,
-            limit: int = Query(50, ge=1, le=100),
-            auth: bool = Depends(self.api_auth)
+            limit: int = Query(50, ge=1, le=100)
         ):
             """
             Récupère les événements du système avec des filtres optionnels
             """
-            try:
-                # Convertir les filtres si nécessaire
-                event_type_filter = None
-                if event_type:
-                    try:
-                        event_type_filter = EventType[event_type.upper()]
-                    except KeyError:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Type d'événement non reconnu: {event_type}"
-                        )
-                
-                # Convertir le timestamp depuis si fourni
-                since_datetime = None
-                if since:
-                    try:
-                        since_datetime = datetime.fromisoformat(since)
-                    except ValueError:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Format de date invalide pour 'since': {since}"
-                        )
-                
-                # Récupérer les événements
-                events = self.event_manager.get_history(
-                    event_type=event_type_filter,
-                    since=since_datetime,
-                    limit=limit
-                )
-                
-                # Filtrer par priorité si demandé
-                if priority:
-                    try:
-                        priority_filter = EventPriority[priority.upper()]
-                        events = [e for e in events if e.priority == priority_filter]
-                    except KeyError:
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Priorité non reconnue: {priority}"
-                        )
-                
-                # Convertir en dictionnaires pour la sortie JSON
-                events_json = [event.to_dict() for event in events]
-                
-                return {
-                    "events": events_json,
-                    "count": len(events_json),
-                    "timestamp": datetime.now().isoformat()
-                }
-            
-            except Exception as e:
-                logger.error(f"Erreur lors de la récupération des événements: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erreur lors de la récupération des événements: {str(e)}"
-                )
-        
-        @self.app.post("/api/activities/propose", tags=["Activités"])
-        async def propose_activity(activity_data: ActivityData, auth: bool = Depends(self.api_auth)):
-            """
-            Propose une activité à l'utilisateur
-            """
-            try:
-                # Déterminer la priorité
+            # Convertir les filtres si nécessaire
+            event_type_filter = None
+            if event_type:
+                event_type_filter = _EVENT_TYPE_MAP.get(event_type.lower())
+                if event_type_filter is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Type d'événement non reconnu: {event_type}"
+                    )
+
+            # Convertir le timestamp depuis si fourni
+            since_datetime = None
+            if since:
                 try:
-                    priority = EventPriority[activity_data.priority.upper()]
-                except KeyError:
+                    # Parseur C, ~10x plus rapide que datetime.fromisoformat
+                    since_datetime = ciso8601.parse_datetime(since)
+                except ValueError:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Priorité non reconnue: {activity_data.priority}"
+                        detail=f"Format de date invalide pour 'since': {since}"
                     )
-                
-                # Créer un événement de suggestion d'activité
-                event = Event(
-                    event_type=EventType.ACTIVITY_SUGGESTION,
-                    priority=priority,
-                    source="api",
-                    data={
-                        'recommendation_type': activity_data.activity_type,
-                        'message': activity_data.description,
-                        'metadata': activity_data.metadata
-                    }
-                )
-                
-                # Publier l'événement
-                await self.event_manager.publish(event)
-                
-                return {
-                    "status": "success",
-                    "event_id": event.id,
-                    "timestamp": event.timestamp.isoformat()
-                }
-            
-            except Exception as e:
-                logger.error(f"Erreur lors de la proposition d'activité: {e}")
+
+            # Convertir le filtre de priorité si fourni
+            priority_filter = None
+            if priority:
+                priority_filter = _PRIORITY_MAP.get(priority.lower())
+                if priority_filter is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Priorité non reconnue: {priority}"
+                    )
+
+            # Récupérer les événements déjà filtrés et sérialisés
+            # (le filtrage par priorité est poussé dans le gestionnaire
+            # pour éviter de matérialiser puis jeter des événements)
+            events_json = self.event_manager.get_history(
+                event_type=event_type_filter,
+                priority=priority_filter,
+                since=since_datetime,
+                limit=limit,
+                as_dicts=True
+            )
+
+            return ORJSONResponse({
+                "events": events_json,
+                "count": len(events_json),
+                "timestamp": _NOW[0]
+            })
+        
+        @self.app.post("/api/activities/propose", status_code=status.HTTP_202_ACCEPTED, tags=["Activités"])
+        async def propose_activity(request: Request):
+            """
+            Propose une activité à l'utilisateur
+            """
+            activity_data = await _decode_body(request, _ACTIVITY_DATA_DECODER)
+
+            # Déterminer la priorité
+            priority = _PRIORITY_MAP.get(activity_data.priority.lower())
+            if priority is None:
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erreur lors de la proposition d'activité: {str(e)}"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Priorité non reconnue: {activity_data.priority}"
                 )
+
+            # Créer un événement de suggestion d'activité
+            event = Event(
+                event_type=EventType.ACTIVITY_SUGGESTION,
+                priority=priority,
+                source="api",
+                data={
+                    'recommendation_type': activity_data.activity_type,
+                    'message': activity_data.description,
+                    'metadata': activity_data.metadata
+                }
+            )
+
+            # Publier l'événement en tâche de fond (la réponse n'attend pas
+            # le traitement des abonnés)
+            await self._publish_background(event)
+
+            return _success_response(event)
         
-        @self.app.post("/api/notifications", tags=["Notifications"])
-        async def send_notification(notification_data: NotificationData, auth: bool = Depends(self.api_auth)):
+        @self.app.post("/api/notifications", status_code=status.HTTP_202_ACCEPTED, tags=["Notifications"])
+        async def send_notification(request: Request):
             """
             Envoie une notification à l'utilisateur
             """
-            try:
-                # Déterminer la priorité
-                try:
-                    priority = EventPriority[notification_data.priority.upper()]
-                except KeyError:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Priorité non reconnue: {notification_data.priority}"
-                    )
-                
-                # Créer un événement de notification
-                event = Event(
-                    event_type=EventType.UI_INTERACTION,
-                    priority=priority,
-                    source="api",
-                    data={
-                        'notification_type': 'message',
-                        'title': notification_data.title,
-                        'message': notification_data.message,
-                        'metadata': notification_data.metadata
-                    }
-                )
-                
-                # Publier l'événement
-                await self.event_manager.publish(event)
-                
-                return {
-                    "status": "success",
-                    "event_id": event.id,
-                    "timestamp": event.timestamp.isoformat()
-                }
-            
-            except Exception as e:
-                logger.error(f"Erreur lors de l'envoi de la notification: {e}")
+            notification_data = await _decode_body(request, _NOTIFICATION_DATA_DECODER)
+
+            # Déterminer la priorité
+            priority = _PRIORITY_MAP.get(notification_data.priority.lower())
+            if priority is None:
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erreur lors de l'envoi de la notification: {str(e)}"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Priorité non reconnue: {notification_data.priority}"
                 )
+
+            # Créer un événement de notification
+            event = Event(
+                event_type=EventType.UI_INTERACTION,
+                priority=priority,
+                source="api",
+                data={
+                    'notification_type': 'message',
+                    'title': notification_data.title,
+                    'message': notification_data.message,
+                    'metadata': notification_data.metadata
+                }
+            )
+
+            # Publier l'événement en tâche de fond (la réponse n'attend pas
+            # le traitement des abonnés)
+            await self._publish_background(event)
+
+            return _success_response(event)
         
-        @self.app.post("/api/events/intrusive/{event_type}", tags=["Événements intrusifs"])
+        @self.app.post("/api/events/intrusive/{event_type}", status_code=status.HTTP_202_ACCEPTED, tags=["Événements intrusifs"])
         async def create_intrusive_event(
-            event_type: str = Path(..., description="Type d'événement intrusif"),
-            data: Dict[str, Any] = Body(..., description="Données de l'événement"),
-            auth: bool = Depends(self.api_auth)
+            request: Request,
+            event_type: str = Path(..., description="Type d'événement intrusif")
         ):
             """
             Crée un événement intrusif (appel, SMS, alerte météo, etc.)
             """
+            # Lire le corps brut avec orjson : le gestionnaire ne fait que des
+            # data.get(...) dessus, la validation Pydantic d'un dict arbitraire
+            # serait du coût pur
+            raw = await request.body()
             try:
-                # Déterminer le type d'événement intrusif
-                event = None
-                
-                if event_type.lower() == "whatsapp_call":
-                    event = IntrusiveEvents.whatsapp_call(
-                        data.get("caller", "Inconnu"),
-                        data.get("video", False)
-                    )
-                
-                elif event_type.lower() == "phone_call":
-                    event = IntrusiveEvents.phone_call(
-                        data.get("caller", "Inconnu")
-                    )
-                
-                elif event_type.lower() == "sms":
-                    event = IntrusiveEvents.sms_received(
-                        data.get("sender", "Inconnu"),
-                        data.get("message", ""),
-                        data.get("urgent", False)
-                    )
-                
-                elif event_type.lower() == "email":
-                    event = IntrusiveEvents.email_received(
-                        data.get("sender", "Inconnu"),
-                        data.get("subject", ""),
-                        data.get("urgent", False)
-                    )
-                
-                elif event_type.lower() == "weather_alert":
-                    event = IntrusiveEvents.weather_alert(
-                        data.get("alert_type", "Alerte météo"),
-                        data.get("description", ""),
-                        data.get("severity", 1)
-                    )
-                
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Type d'événement intrusif non reconnu: {event_type}"
-                    )
-                
-                # Publier l'événement
-                await self.event_manager.publish(event)
-                
-                return {
-                    "status": "success",
-                    "event_id": event.id,
-                    "timestamp": event.timestamp.isoformat()
-                }
-            
-            except Exception as e:
-                logger.error(f"Erreur lors de la création de l'événement intrusif: {e}")
+                data = orjson.loads(raw) if raw else {}
+            except orjson.JSONDecodeError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="JSON invalide"
+                )
+
+            if not isinstance(data, dict):
                 raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erreur lors de la création de l'événement intrusif: {str(e)}"
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Le corps de la requête doit être un objet JSON"
                 )
+
+            # Déterminer le type d'événement intrusif via la table de
+            # répartition (une recherche dict au lieu de cinq comparaisons)
+            entry = _INTRUSIVE_DISPATCH.get(event_type.lower())
+            if entry is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Type d'événement intrusif non reconnu: {event_type}"
+                )
+
+            constructor, arg_spec = entry
+            event = constructor(*(data.get(key, default) for key, default in arg_spec))
+
+            # Publier l'événement en tâche de fond (la réponse n'attend pas
+            # le traitement des abonnés)
+            await self._publish_background(event)
+
+            return _success_response(event)
         
         @self.app.get("/api/config", tags=["Configuration"])
-        async def get_config(auth: bool = Depends(self.api_auth)):
+        async def get_config():
             """
             Récupère la configuration actuelle de l'application
             """
+            # Payload pré-sérialisé dans __init__ (la configuration ne change
+            # pas pendant la vie du processus)
+            return Response(content=self._config_payload, media_type="application/json")
+
+        # Générer et sérialiser le schéma OpenAPI une seule fois au démarrage,
+        # puis remplacer la route par défaut (qui ré-encode le schéma en JSON
+        # à chaque requête) par le renvoi des bytes pré-calculés
+        self._openapi_bytes = orjson.dumps(self.app.openapi())
+        self.app.router.routes = [
+            route for route in self.app.router.routes
+            if getattr(route, "path", None) != "/openapi.json"
+        ]
+
+        @self.app.get("/openapi.json", include_in_schema=False)
+        async def serve_openapi():
+            """
+            Retourne le schéma OpenAPI pré-sérialisé
+            """
+            return Response(content=self._openapi_bytes, media_type="application/json")
+
+    def _build_config_dict(self) -> Dict[str, Any]:
+        """
+        Construit le dictionnaire de configuration exposé par /api/config
+
+        Returns:
+            Dict[str, Any]: Configuration de l'application sans les données sensibles
+        """
+        return {
+            "server": {
+                "host": self.settings.host,
+                "port": self.settings.port,
+                "debug": self.settings.debug
+            },
+            "avatar": {
+                "enabled": self.settings.avatar_enabled,
+                "position": self.settings.avatar_position,
+                "size": self.settings.avatar_size
+            },
+            "priorities": {
+                "high_priority_duration": self.settings.high_priority_duration,
+                "medium_priority_duration": self.settings.medium_priority_duration,
+                "thresholds": self.settings.priority_thresholds
+            },
+            "recommendations": {
+                "medication_times": self.settings.medication_times,
+                "meal_times": self.settings.meal_times,
+                "weather_check_times": self.settings.weather_check_times
+            },
+            "intrusive_events": self.settings.intrusive_events
+        }
+    
+    async def _drain_publish_queue(self):
+        """
+        Transmet en tâche de fond les événements mis en file par les routes
+        """
+        while True:
+            event = await self._publish_queue.get()
             try:
-                # Exclure les données sensibles
-                config = {
-                    "server": {
-                        "host": self.settings.host,
-                        "port": self.settings.port,
-                        "debug": self.settings.debug
-                    },
-                    "avatar": {
-                        "enabled": self.settings.avatar_enabled,
-                        "position": self.settings.avatar_position,
-                        "size": self.settings.avatar_size
-                    },
-                    "priorities": {
-                        "high_priority_duration": self.settings.high_priority_duration,
-                        "medium_priority_duration": self.settings.medium_priority_duration,
-                        "thresholds": self.settings.priority_thresholds
-                    },
-                    "recommendations": {
-                        "medication_times": self.settings.medication_times,
-                        "meal_times": self.settings.meal_times,
-                        "weather_check_times": self.settings.weather_check_times
-                    },
-                    "intrusive_events": self.settings.intrusive_events
-                }
-                
-                return config
-            
+                await self.event_manager.publish(event)
             except Exception as e:
-                logger.error(f"Erreur lors de la récupération de la configuration: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erreur lors de la récupération de la configuration: {str(e)}"
-                )
-    
+                logger.error(f"Erreur lors de la publication différée de l'événement: {e}")
+            finally:
+                self._publish_queue.task_done()
+
+    async def _publish_background(self, event: Event) -> None:
+        """
+        Met un événement en file pour publication en tâche de fond
+
+        En cas de saturation de la file (contre-pression), retombe sur une
+        publication synchrone.
+
+        Args:
+            event (Event): Événement à publier
+        """
+        try:
+            self._publish_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("File de publication saturée, publication synchrone de l'événement")
+            await self.event_manager.publish(event)
+
     async def start(self):
         """
         Démarre le serveur API
         """
         # Créer et démarrer le serveur Uvicorn
+        # httptools (parseur HTTP en C) est nettement plus rapide que h11 par
+        # défaut. Pas de paramètre loop= ici : serve() est attendu sur la
+        # boucle déjà en cours, qu'uvicorn ne peut plus remplacer — uvloop est
+        # installé au niveau application par la politique de core/app_manager
         config = uvicorn.Config(
             app=self.app,
             host=self.host,
             port=self.port,
+            http="httptools",
             log_level="info" if not self.settings.debug else "debug"
         )
         
         self.server = uvicorn.Server(config)
-        
+
+        # Démarrer la tâche de rafraîchissement de l'horodatage partagé
+        self._now_task = asyncio.create_task(_refresh_now())
+
+        # Démarrer le drainage de la file de publication
+        self._publish_task = asyncio.create_task(self._drain_publish_queue())
+
         # Démarrer le serveur dans une tâche asyncio
         await self.server.serve()
     
@@ -464,6 +621,14 @@ class ApiServer:
         """
         Arrête le serveur API
         """
+        for task in (self._now_task, self._publish_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
         if self.server:
             self.server.should_exit = True
             logger.info("Serveur API arrêté")
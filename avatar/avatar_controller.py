@@ -7,9 +7,8 @@ Contrôleur d'avatar qui gère l'interface utilisateur de l'assistant.
 
 import asyncio
 import logging
-import threading
-import queue
 import os
+from collections import deque
 from enum import Enum, auto
 from typing import Dict, Any, List, Optional, Tuple, Callable
 from datetime import datetime, timedelta
@@ -25,6 +24,27 @@ from events.event_types import Event, EventType, EventPriority
 
 logger = logging.getLogger("angel.avatar")
 
+# Chemins des ressources, résolus une seule fois à l'import : l'existence des
+# fichiers est vérifiée ici pour que ni l'ouverture d'une fenêtre ni le
+# chargement du cache d'animations ne refasse de jointure de chemins ni de
+# stat() sur disque
+_ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+_TRAY_ICON_PATH = os.path.join(_ASSETS_DIR, "tray_icon.png")
+if not os.path.exists(_TRAY_ICON_PATH):
+    _TRAY_ICON_PATH = None
+
+_AVATAR_FRAME_PATHS = {}
+for _kind, _count in (("idle", 1), ("speaking", 3), ("alert", 2), ("active", 2)):
+    for _frame in range(_count):
+        if _kind == "idle":
+            _path = os.path.join(_ASSETS_DIR, "avatar_idle.png")
+        else:
+            _path = os.path.join(_ASSETS_DIR, f"avatar_{_kind}_{_frame}.png")
+        if os.path.exists(_path):
+            _AVATAR_FRAME_PATHS[(_kind, _frame)] = _path
+
+
 class AvatarState(Enum):
     """États possibles de l'avatar"""
     IDLE = auto()       # Au repos, pas d'activité
@@ -35,18 +55,37 @@ class AvatarState(Enum):
     WAITING = auto()    # En attente de l'utilisateur
 
 
+# Formatage des événements de haute priorité : chaque type est associé à un
+# formateur qui retourne (titre, message) à partir des données de l'événement,
+# ou None si l'événement ne justifie pas de notification intrusive. Le dispatch
+# devient une recherche O(1) au lieu d'une chaîne de comparaisons
+_SOMEONE = "Quelqu'un"
+
+_HIGH_PRIORITY_FORMATS = {
+    EventType.WHATSAPP_CALL: lambda d: (
+        "Appel WhatsApp",
+        f"Appel entrant de {d.get('caller', _SOMEONE)}"),
+    EventType.PHONE_CALL: lambda d: (
+        "Appel téléphonique",
+        f"Appel entrant de {d.get('caller', _SOMEONE)}"),
+    EventType.SMS_RECEIVED: lambda d: (
+        "SMS urgent",
+        f"Message de {d.get('sender', _SOMEONE)}") if d.get('urgent', False) else None,
+    EventType.EMAIL_RECEIVED: lambda d: (
+        "Email urgent",
+        f"De: {d.get('sender', _SOMEONE)}\nObjet: {d.get('subject', 'Sans sujet')}") if d.get('urgent', False) else None,
+    EventType.WEATHER_ALERT: lambda d: (
+        f"Alerte météo: {d.get('alert_type', 'Alerte météo')}",
+        d.get('description', 'Conditions météorologiques importantes')),
+}
+
+
 class AvatarController(QObject):
     """
     Contrôleur principal pour l'avatar de l'assistant.
     Gère l'interface utilisateur et les interactions.
     """
     
-    # Signaux pour la communication avec l'interface Qt
-    show_notification_signal = pyqtSignal(str, str, str, int)
-    show_avatar_signal = pyqtSignal(dict)
-    update_avatar_signal = pyqtSignal(dict)
-    hide_avatar_signal = pyqtSignal()
-    
     def __init__(self, event_manager: EventManager, settings: Settings):
         """
         Initialise le contrôleur d'avatar
@@ -63,21 +102,43 @@ class AvatarController(QObject):
         self.qt_app = None
         self.tray_icon = None
         self.avatar_window = None
-        self.message_queue = queue.Queue()
-        self.ui_thread = None
-        
-        # File d'attente des recommandations
-        self.pending_recommendations = []
+
+        # File d'attente des recommandations, bornée pour éviter toute
+        # croissance mémoire sous un flux soutenu de suggestions (les plus
+        # anciennes sont silencieusement abandonnées une fois la file pleine)
+        self.pending_recommendations = deque(maxlen=64)
+
+        # Coalescence des messages UI : sous une rafale d'événements, seul le
+        # dernier état compte. Chaque type de message occupe un emplacement
+        # unique qui est écrasé par le suivant, et un seul passage en fin de
+        # tour de boucle applique au plus un show, un update et un hide
+        self._pending_show: Optional[Dict[str, Any]] = None
+        self._pending_update: Optional[Dict[str, Any]] = None
+        self._pending_hide = False
+        self._flush_scheduled = False
+
+        # Magasin de charges utiles, indexé par ID de recommandation : seul
+        # l'identifiant circule entre la coalescence et le slot d'affichage,
+        # le dictionnaire complet est récupéré ici par référence
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+
+        # Résoudre le backend de notification une seule fois : plyer refait
+        # sinon sa découverte de plateforme (imports, réflexion) à chaque appel
+        self._notify = (notification.get_notifier()
+                        if hasattr(notification, 'get_notifier')
+                        else notification.notify)
         
         # Timer pour les animations et transitions
         self.animation_timer = None
         self.hide_timer = None
-        
-        # Connecter les signaux
-        self.show_notification_signal.connect(self._show_notification_slot)
-        self.show_avatar_signal.connect(self._show_avatar_slot)
-        self.update_avatar_signal.connect(self._update_avatar_slot)
-        self.hide_avatar_signal.connect(self._hide_avatar_slot)
+        self.next_timer = None
+
+        # Table d'animation : état -> (nom de l'animation, nombre d'images)
+        self._anim_table = {
+            AvatarState.SPEAKING: ("speaking", 3),
+            AvatarState.ALERT: ("alert", 2),
+            AvatarState.ACTIVE: ("active", 2),
+        }
         
         # S'abonner aux événements pertinents
         self.event_manager.subscribe(EventType.ACTIVITY_SUGGESTION, self._handle_activity_suggestion)
@@ -94,16 +155,32 @@ class AvatarController(QObject):
         
         logger.info("Démarrage du contrôleur d'avatar")
         self.running = True
-        
-        # Démarrer l'interface Qt dans un thread séparé
-        self.ui_thread = threading.Thread(target=self._run_ui_thread)
-        self.ui_thread.daemon = True
-        self.ui_thread.start()
-        
-        # Attendre que l'interface Qt soit initialisée
-        while not self.qt_app:
-            await asyncio.sleep(0.1)
-        
+
+        # L'interface Qt vit sur le thread principal : la QApplication est
+        # créée au démarrage (main.py) et la boucle qasync pilote à la fois
+        # Qt et asyncio — aucun thread UI ni file de messages n'est nécessaire
+        self.qt_app = QApplication.instance()
+
+        # Créer une icône de notification système
+        self._create_tray_icon()
+
+        # Créer la fenêtre d'avatar (initialement cachée)
+        self._create_avatar_window()
+
+        # Configurer les timers
+        self.animation_timer = QTimer()
+        self.animation_timer.timeout.connect(self._update_animation)
+
+        self.hide_timer = QTimer()
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self._hide_avatar_slot)
+
+        # Timer réutilisable d'enchaînement des recommandations : évite
+        # d'allouer un QTimer + une closure à chaque clic de l'utilisateur
+        self.next_timer = QTimer()
+        self.next_timer.setSingleShot(True)
+        self.next_timer.timeout.connect(self._advance_queue)
+
         logger.info("Contrôleur d'avatar démarré")
     
     async def stop(self):
@@ -114,101 +191,76 @@ class AvatarController(QObject):
         
         logger.info("Arrêt du contrôleur d'avatar")
         self.running = False
-        
-        # Informer le thread UI de s'arrêter
-        self.message_queue.put(("quit", None))
-        
-        # Attendre que le thread UI se termine
-        if self.ui_thread:
-            self.ui_thread.join(timeout=5)
-        
+
+        # Arrêter les timers et masquer l'interface
+        if self.animation_timer:
+            self.animation_timer.stop()
+        if self.hide_timer:
+            self.hide_timer.stop()
+        if self.next_timer:
+            self.next_timer.stop()
+        if self.avatar_window:
+            self.avatar_window.hide()
+        if self.tray_icon:
+            self.tray_icon.hide()
+
         self.qt_app = None
         self.tray_icon = None
         self.avatar_window = None
-        
+
         logger.info("Contrôleur d'avatar arrêté")
-    
-    def _run_ui_thread(self):
-        """
-        Fonction principale du thread UI
-        """
-        try:
-            self.qt_app = QApplication([])
-            self.qt_app.setQuitOnLastWindowClosed(False)
-            
-            # Créer une icône de notification système
-            self._create_tray_icon()
-            
-            # Créer la fenêtre d'avatar (initialement cachée)
-            self._create_avatar_window()
-            
-            # Configurer les timers
-            self.animation_timer = QTimer()
-            self.animation_timer.timeout.connect(self._update_animation)
-            
-            self.hide_timer = QTimer()
-            self.hide_timer.setSingleShot(True)
-            self.hide_timer.timeout.connect(lambda: self.hide_avatar_signal.emit())
-            
-            # Boucle principale
-            while self.running:
-                # Traiter les événements Qt
-                self.qt_app.processEvents()
-                
-                # Vérifier les messages de la file d'attente
-                try:
-                    message_type, message_data = self.message_queue.get(block=False)
-                    self._handle_message(message_type, message_data)
-                    self.message_queue.task_done()
-                except queue.Empty:
-                    pass
-                
-                # Dormir un peu pour ne pas saturer le CPU
-                QApplication.instance().thread().msleep(100)
-        
-        except Exception as e:
-            logger.error(f"Erreur dans le thread UI: {e}")
-        finally:
-            if self.qt_app:
-                self.qt_app.quit()
-    
-    def _handle_message(self, message_type: str, message_data: Any):
+
+    def _post_ui(self, message_type: str, data: Optional[Dict[str, Any]] = None):
         """
-        Traite les messages reçus de la file d'attente
-        
+        Enregistre un message UI en écrasant tout message antérieur du même
+        type, puis planifie un unique vidage en fin de tour de boucle
+
         Args:
-            message_type (str): Type de message
-            message_data (Any): Données du message
+            message_type (str): Type de message ("show_avatar",
+                "update_avatar" ou "hide_avatar")
+            data (Optional[Dict[str, Any]]): Données associées au message
         """
-        if message_type == "quit":
-            self.qt_app.quit()
-        
-        elif message_type == "show_notification":
-            title, message, app_name, timeout = message_data
-            self.show_notification_signal.emit(title, message, app_name, timeout)
-        
-        elif message_type == "show_avatar":
-            self.show_avatar_signal.emit(message_data)
-        
+        if message_type == "show_avatar":
+            self._pending_show = data
         elif message_type == "update_avatar":
-            self.update_avatar_signal.emit(message_data)
-        
+            self._pending_update = data
         elif message_type == "hide_avatar":
-            self.hide_avatar_signal.emit()
-    
+            # Un hide rend caducs les show encore en attente
+            self._pending_show = None
+            self._pending_hide = True
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._flush_ui)
+
+    def _flush_ui(self):
+        """
+        Applique les messages UI en attente (au plus un par type)
+        """
+        self._flush_scheduled = False
+
+        show, self._pending_show = self._pending_show, None
+        update, self._pending_update = self._pending_update, None
+        hide, self._pending_hide = self._pending_hide, False
+
+        if show is not None:
+            recommendation_id = show.get('recommendation_id', '')
+            self._payloads[recommendation_id] = show
+            self._show_avatar_slot(recommendation_id)
+        if update is not None:
+            self._update_avatar_slot(update)
+        if hide:
+            self._hide_avatar_slot()
+
     def _create_tray_icon(self):
         """
         Crée l'icône de notification système
         """
-        icon_path = os.path.join(os.path.dirname(__file__), "assets", "tray_icon.png")
-        
         # Utiliser une icône par défaut si l'icône personnalisée n'existe pas
-        if not os.path.exists(icon_path):
-            icon_path = None
-        
+        # (chemin résolu à l'import du module)
         self.tray_icon = QSystemTrayIcon()
-        if icon_path:
-            self.tray_icon.setIcon(QIcon(icon_path))
+        if _TRAY_ICON_PATH:
+            self.tray_icon.setIcon(QIcon(_TRAY_ICON_PATH))
         else:
             self.tray_icon.setIcon(QIcon.fromTheme("dialog-information"))
         
@@ -217,12 +269,12 @@ class AvatarController(QObject):
         
         # Action pour afficher l'avatar
         show_action = QAction("Afficher l'avatar", self)
-        show_action.triggered.connect(lambda: self.show_avatar_signal.emit({}))
+        show_action.triggered.connect(lambda: self._show_avatar_slot(""))
         tray_menu.addAction(show_action)
         
         # Action pour masquer l'avatar
         hide_action = QAction("Masquer l'avatar", self)
-        hide_action.triggered.connect(lambda: self.hide_avatar_signal.emit())
+        hide_action.triggered.connect(self._hide_avatar_slot)
         tray_menu.addAction(hide_action)
         
         # Séparateur
@@ -254,6 +306,22 @@ class AvatarController(QObject):
         """
         Affiche une notification système
         
+        Args:
+            title (str): Titre de la notification
+            message (str): Message de la notification
+            app_name (str): Nom de l'application
+            timeout (int): Délai d'expiration en secondes
+        """
+        # Déporter l'appel bloquant (D-Bus/Win32) dans l'executor : exécuté
+        # sur la boucle qasync partagée avec Qt, il figerait sinon les
+        # animations le temps de la remise de la notification
+        loop = asyncio.get_event_loop()
+        loop.run_in_executor(None, self._notify_blocking, title, message, app_name, timeout)
+
+    def _notify_blocking(self, title: str, message: str, app_name: str, timeout: int):
+        """
+        Remet la notification au backend (appelé depuis l'executor)
+
         Args:
             title (str): Titre de la notification
             message (str): Message de la notification
@@ -261,7 +329,7 @@ class AvatarController(QObject):
             timeout (int): Délai d'expiration en secondes
         """
         try:
-            notification.notify(
+            self._notify(
                 title=title,
                 message=message,
                 app_name=app_name,
@@ -270,17 +338,21 @@ class AvatarController(QObject):
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage de la notification: {e}")
     
-    def _show_avatar_slot(self, data: Dict[str, Any]):
+    def _show_avatar_slot(self, recommendation_id: str):
         """
-        Affiche l'avatar avec les données spécifiées
-        
+        Affiche l'avatar à partir de la charge utile stockée sous cet ID
+
         Args:
-            data (Dict[str, Any]): Données à afficher (message, état, etc.)
+            recommendation_id (str): ID de la recommandation à afficher
         """
         if not self.avatar_window:
             logger.error("Fenêtre d'avatar non initialisée")
             return
-        
+
+        # Récupérer la charge utile par référence (le signal ne transporte
+        # que l'identifiant)
+        data = self._payloads.pop(recommendation_id, {})
+
         # Mettre à jour l'état
         self.state = data.get('state', AvatarState.ACTIVE)
         
@@ -329,14 +401,11 @@ class AvatarController(QObject):
         """
         if not self.avatar_window or not self.avatar_window.isVisible():
             return
-        
+
         # Mettre à jour l'animation en fonction de l'état
-        if self.state == AvatarState.SPEAKING:
-            self.avatar_window.update_speaking_animation()
-        elif self.state == AvatarState.ALERT:
-            self.avatar_window.update_alert_animation()
-        elif self.state == AvatarState.ACTIVE:
-            self.avatar_window.update_active_animation()
+        entry = self._anim_table.get(self.state)
+        if entry:
+            self.avatar_window.advance_animation(*entry)
     
     def _on_recommendation_accepted(self, recommendation_id: str):
         """
@@ -345,15 +414,9 @@ class AvatarController(QObject):
         Args:
             recommendation_id (str): ID de la recommandation
         """
-        # Passer à la recommandation suivante s'il y en a une
-        if self.pending_recommendations:
-            next_recommendation = self.pending_recommendations.pop(0)
-            
-            # Afficher la recommandation suivante après un court délai
-            QTimer.singleShot(1000, lambda: self.show_avatar_signal.emit(next_recommendation))
-        else:
-            # Cacher l'avatar après un court délai
-            QTimer.singleShot(2000, lambda: self.hide_avatar_signal.emit())
+        # Passer à la recommandation suivante (ou cacher l'avatar) après un
+        # court délai, via le timer réutilisable
+        self.next_timer.start(1000 if self.pending_recommendations else 2000)
     
     def _on_recommendation_declined(self, recommendation_id: str):
         """
@@ -362,22 +425,26 @@ class AvatarController(QObject):
         Args:
             recommendation_id (str): ID de la recommandation
         """
-        # Passer à la recommandation suivante s'il y en a une
+        # Passer à la recommandation suivante (ou cacher l'avatar) après un
+        # court délai, via le timer réutilisable
+        self.next_timer.start(1000)
+    
+    def _advance_queue(self):
+        """
+        Affiche la prochaine recommandation en attente, ou cache l'avatar
+        s'il n'en reste aucune
+        """
         if self.pending_recommendations:
-            next_recommendation = self.pending_recommendations.pop(0)
-            
-            # Afficher la recommandation suivante après un court délai
-            QTimer.singleShot(1000, lambda: self.show_avatar_signal.emit(next_recommendation))
+            self._post_ui("show_avatar", self.pending_recommendations.popleft())
         else:
-            # Cacher l'avatar après un court délai
-            QTimer.singleShot(1000, lambda: self.hide_avatar_signal.emit())
-    
+            self._hide_avatar_slot()
+
     def _on_avatar_closed(self):
         """
         Appelé lorsque la fenêtre de l'avatar est fermée par l'utilisateur
         """
         # Vider la file d'attente des recommandations
-        self.pending_recommendations = []
+        self.pending_recommendations.clear()
         
         # Mettre à jour l'état
         self.state = AvatarState.HIDDEN
@@ -410,7 +477,7 @@ class AvatarController(QObject):
                 self.pending_recommendations.append(avatar_data)
             else:
                 # Afficher l'avatar immédiatement
-                self.message_queue.put(("show_avatar", avatar_data))
+                self._post_ui("show_avatar", avatar_data)
         else:
             # Pour les suggestions de priorité normale ou basse,
             # les ajouter à la file d'attente et afficher l'avatar
@@ -420,8 +487,8 @@ class AvatarController(QObject):
             if self.state == AvatarState.HIDDEN or not (self.avatar_window and self.avatar_window.isVisible()):
                 # Afficher la première recommandation
                 if self.pending_recommendations:
-                    first_recommendation = self.pending_recommendations.pop(0)
-                    self.message_queue.put(("show_avatar", first_recommendation))
+                    first_recommendation = self.pending_recommendations.popleft()
+                    self._post_ui("show_avatar", first_recommendation)
     
     async def _handle_high_priority(self, event: Event):
         """
@@ -430,49 +497,23 @@ class AvatarController(QObject):
         Args:
             event (Event): Événement de haute priorité
         """
+        # Les suggestions d'activité ont leur propre abonné typé
+        # (_handle_activity_suggestion) qui gère lui-même l'escalade selon la
+        # priorité : ne pas les traiter une seconde fois ici, sous peine de
+        # doubler notifications et affichages d'avatar
+        if event.event_type == EventType.ACTIVITY_SUGGESTION:
+            return
+
         # Pour les événements de haute priorité, afficher immédiatement
-        # selon le type d'événement
-        if event.event_type == EventType.WHATSAPP_CALL:
-            caller = event.data.get('caller', 'Quelqu\'un')
-            self._show_intrusive_notification(
-                "Appel WhatsApp",
-                f"Appel entrant de {caller}",
-                event
-            )
-        
-        elif event.event_type == EventType.PHONE_CALL:
-            caller = event.data.get('caller', 'Quelqu\'un')
-            self._show_intrusive_notification(
-                "Appel téléphonique",
-                f"Appel entrant de {caller}",
-                event
-            )
-        
-        elif event.event_type == EventType.SMS_RECEIVED and event.data.get('urgent', False):
-            sender = event.data.get('sender', 'Quelqu\'un')
-            self._show_intrusive_notification(
-                "SMS urgent",
-                f"Message de {sender}",
-                event
-            )
-        
-        elif event.event_type == EventType.EMAIL_RECEIVED and event.data.get('urgent', False):
-            sender = event.data.get('sender', 'Quelqu\'un')
-            subject = event.data.get('subject', 'Sans sujet')
-            self._show_intrusive_notification(
-                "Email urgent",
-                f"De: {sender}\nObjet: {subject}",
-                event
-            )
-        
-        elif event.event_type == EventType.WEATHER_ALERT:
-            alert_type = event.data.get('alert_type', 'Alerte météo')
-            description = event.data.get('description', 'Conditions météorologiques importantes')
-            self._show_intrusive_notification(
-                f"Alerte météo: {alert_type}",
-                description,
-                event
-            )
+        # selon le type d'événement (dispatch par table)
+        formatter = _HIGH_PRIORITY_FORMATS.get(event.event_type)
+        if formatter is None:
+            return
+
+        formatted = formatter(event.data)
+        if formatted is not None:
+            title, message = formatted
+            self._show_intrusive_notification(title, message, event)
     
     async def _handle_critical_priority(self, event: Event):
         """
@@ -495,10 +536,7 @@ class AvatarController(QObject):
             event (Event): Événement associé
         """
         # Afficher une notification système
-        self.message_queue.put((
-            "show_notification",
-            (title, message, "Angel Assistant", 10)
-        ))
+        self._show_notification_slot(title, message, "Angel Assistant", 10)
         
         # Afficher l'avatar en mode alerte
         avatar_data = {
@@ -508,9 +546,9 @@ class AvatarController(QObject):
             'recommendation_id': event.id,
             'timeout': 0  # Pas de timeout pour les alertes
         }
-        
-        self.message_queue.put(("show_avatar", avatar_data))
-        
+
+        self._post_ui("show_avatar", avatar_data)
+
         # Démarrer l'animation d'alerte
         if not self.animation_timer.isActive():
             self.animation_timer.start(200)  # Mise à jour toutes les 200ms
@@ -539,7 +577,21 @@ class AvatarWindow(QWidget):
         self.current_recommendation_id = ""
         self.current_metadata = {}
         self.animation_frame = 0
-        
+
+        # Dernier état rendu : permet d'ignorer les mises à jour redondantes
+        # (setText déclenche relayout + repaint même à texte identique)
+        self._last_message = None
+        self._buttons_visible = None
+
+        # Précharger toutes les images d'animation une seule fois : les
+        # méthodes d'animation piochent ensuite dans ce cache au lieu de
+        # relire et décoder un PNG sur disque à chaque tick de 200 ms
+        # (les chemins sont déjà résolus et vérifiés à l'import du module)
+        self._frames: Dict[Tuple[str, int], QPixmap] = {
+            key: QPixmap(frame_path).scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio)
+            for key, frame_path in _AVATAR_FRAME_PATHS.items()
+        }
+
         # Configurer la fenêtre
         self.setWindowTitle("Angel Assistant")
         self.setMinimumSize(300, 200)
@@ -585,11 +637,10 @@ class AvatarWindow(QWidget):
         self.avatar_image.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.avatar_image.setMinimumSize(100, 100)
         
-        # Charger l'image d'avatar
-        avatar_path = os.path.join(os.path.dirname(__file__), "assets", "avatar_idle.png")
-        if os.path.exists(avatar_path):
-            pixmap = QPixmap(avatar_path)
-            self.avatar_image.setPixmap(pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio))
+        # Charger l'image d'avatar depuis le cache de pixmaps
+        pixmap = self._frames.get(("idle", 0))
+        if pixmap is not None:
+            self.avatar_image.setPixmap(pixmap)
         else:
             self.avatar_image.setText("Avatar")
         
@@ -630,17 +681,23 @@ class AvatarWindow(QWidget):
             metadata (Dict[str, Any]): Métadonnées associées
             recommendation_id (str): ID de la recommandation
         """
-        self.message_label.setText(message)
+        if message != self._last_message:
+            self._last_message = message
+            self.message_label.setText(message)
         self.current_metadata = metadata
         self.current_recommendation_id = recommendation_id
-        
-        # Afficher ou masquer les boutons selon le contexte
-        if recommendation_id:
-            self.accept_button.show()
-            self.decline_button.show()
-        else:
-            self.accept_button.hide()
-            self.decline_button.hide()
+
+        # Afficher ou masquer les boutons selon le contexte, sans toucher
+        # aux widgets s'ils sont déjà dans l'état voulu
+        buttons_visible = bool(recommendation_id)
+        if buttons_visible != self._buttons_visible:
+            self._buttons_visible = buttons_visible
+            if buttons_visible:
+                self.accept_button.show()
+                self.decline_button.show()
+            else:
+                self.accept_button.hide()
+                self.decline_button.hide()
     
     def update_message(self, message: str):
         """
@@ -649,40 +706,24 @@ class AvatarWindow(QWidget):
         Args:
             message (str): Nouveau message
         """
+        if message == self._last_message:
+            return
+
+        self._last_message = message
         self.message_label.setText(message)
     
-    def update_speaking_animation(self):
-        """
-        Met à jour l'animation de parole
-        """
-        self.animation_frame = (self.animation_frame + 1) % 3
-        avatar_path = os.path.join(os.path.dirname(__file__), "assets", f"avatar_speaking_{self.animation_frame}.png")
-        
-        if os.path.exists(avatar_path):
-            pixmap = QPixmap(avatar_path)
-            self.avatar_image.setPixmap(pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio))
-    
-    def update_alert_animation(self):
-        """
-        Met à jour l'animation d'alerte
-        """
-        self.animation_frame = (self.animation_frame + 1) % 2
-        avatar_path = os.path.join(os.path.dirname(__file__), "assets", f"avatar_alert_{self.animation_frame}.png")
-        
-        if os.path.exists(avatar_path):
-            pixmap = QPixmap(avatar_path)
-            self.avatar_image.setPixmap(pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio))
-    
-    def update_active_animation(self):
+    def advance_animation(self, name: str, frame_count: int):
         """
-        Met à jour l'animation d'activité
+        Avance l'animation d'un cran à partir du cache de pixmaps
+
+        Args:
+            name (str): Nom de l'animation ("speaking", "alert", "active")
+            frame_count (int): Nombre d'images de l'animation
         """
-        self.animation_frame = (self.animation_frame + 1) % 2
-        avatar_path = os.path.join(os.path.dirname(__file__), "assets", f"avatar_active_{self.animation_frame}.png")
-        
-        if os.path.exists(avatar_path):
-            pixmap = QPixmap(avatar_path)
-            self.avatar_image.setPixmap(pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio))
+        self.animation_frame = (self.animation_frame + 1) % frame_count
+        pixmap = self._frames.get((name, self.animation_frame))
+        if pixmap is not None:
+            self.avatar_image.setPixmap(pixmap)
     
     def _on_accept_clicked(self):
         """
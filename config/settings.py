@@ -6,20 +6,125 @@ Module de configuration pour l'assistant Angel.
 Centralise tous les paramètres configurables de l'application.
 """
 
+import glob
 import os
 import json
 import logging
+import pickle
 from pathlib import Path
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-# Chargement des variables d'environnement depuis .env s'il existe
-load_dotenv()
+# orjson analyse le JSON nettement plus vite que le module standard ; la
+# configuration reste lisible sans lui, il n'est donc qu'optionnel
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("angel.config")
 
+# Le fichier .env n'est ouvert et analysé qu'au premier besoin réel d'une
+# variable d'environnement, pas à l'import du module : les processus qui
+# n'interrogent jamais l'environnement ne paient rien
+_DOTENV_LOADED = False
+
+# Instantané figé des variables consultées par la configuration, pris juste
+# après le chargement de .env : les lectures suivantes ne reparcourent plus
+# os.environ
+_ENV_SNAPSHOT = MappingProxyType({})
+
+
+def _ensure_dotenv():
+    """Charge les variables d'environnement depuis .env (une seule fois)"""
+    global _DOTENV_LOADED, _ENV_SNAPSHOT
+    if not _DOTENV_LOADED:
+        load_dotenv()
+        _ENV_SNAPSHOT = MappingProxyType({
+            key: os.environ.get(key)
+            for key in ("WEATHER_API_KEY", "ANGEL_CONFIG")
+        })
+        _DOTENV_LOADED = True
+
+
+# Valeurs par défaut composites, construites une seule fois au chargement du
+# module : chaque instance de Settings référence les mêmes objets au lieu de
+# reconstruire ces littéraux
+_DEFAULT_THRESHOLDS = {
+    "high": 80,
+    "medium": 50,
+    "low": 20
+}
+
+_DEFAULT_INTRUSIVE = {
+    "whatsapp_call": True,
+    "phone_call": True,
+    "urgent_email": True,
+    "weather_alert": True,
+    "sms": True
+}
+
+
+def _to_minutes(hhmm):
+    """
+    Convertit une heure "HH:MM" en minutes depuis minuit
+
+    Args:
+        hhmm (str): Heure au format "HH:MM"
+
+    Returns:
+        int: Nombre de minutes depuis minuit
+    """
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
 class Settings:
     """Classe qui contient tous les paramètres de configuration"""
-    
+
+    # Correspondance attribut -> (section, clé, valeur par défaut). Une clé
+    # None désigne la section entière. Les paramètres ne sont résolus qu'au
+    # premier accès (voir __getattr__) puis mis en cache dans l'instance :
+    # seuls ceux réellement utilisés par les sous-systèmes actifs sont
+    # matérialisés
+    _SECTION_MAP = {
+        "host": ("server", "host", "127.0.0.1"),
+        "port": ("server", "port", 8000),
+        "debug": ("server", "debug", False),
+        "avatar_enabled": ("avatar", "enabled", True),
+        "avatar_position": ("avatar", "position", "bottom-right"),
+        "avatar_size": ("avatar", "size", "medium"),
+        "angel_server_url": ("angel_server_capture", "url", "http://localhost:5000"),
+        "angel_server_key": ("angel_server_capture", "api_key", None),
+        "polling_interval": ("angel_server_capture", "polling_interval", 10),
+        "high_priority_duration": ("priorities", "high_priority_duration", 60),
+        "medium_priority_duration": ("priorities", "medium_priority_duration", 300),
+        "priority_thresholds": ("priorities", "thresholds", _DEFAULT_THRESHOLDS),
+        "medication_times": ("recommendations", "medication_times", ["08:00", "12:00", "18:00", "22:00"]),
+        "meal_times": ("recommendations", "meal_times", ["07:30", "12:30", "19:00"]),
+        "weather_check_times": ("recommendations", "weather_check_times", ["07:00", "12:00", "18:00"]),
+        "max_recent_activities": ("recommendations", "max_recent_activities", 10000),
+        "weather_api_key": ("weather", "api_key", ""),
+        "weather_location": ("weather", "location", "Paris,FR"),
+        "weather_update_interval": ("weather", "update_interval", 3600),
+        "weather_min_update_interval": ("weather", "min_update_interval", 600),
+        "weather_max_update_interval": ("weather", "max_update_interval", 21600),
+        "enable_desktop_notifications": ("notifications", "enable_desktop", True),
+        "notification_sound": ("notifications", "sound", True),
+        "notification_duration": ("notifications", "duration", 10),
+        "intrusive_events": ("intrusive_events", None, _DEFAULT_INTRUSIVE),
+    }
+
+    # Formes pré-analysées des listes d'horaires "HH:MM" : converties une
+    # fois en minutes depuis minuit, les comparaisons répétées des
+    # planificateurs deviennent des comparaisons d'entiers au lieu de
+    # re-découper les chaînes à chaque vérification. Les listes de chaînes
+    # d'origine restent disponibles pour l'affichage et la sauvegarde
+    _DERIVED_MINUTES = {
+        "medication_minutes": "medication_times",
+        "meal_minutes": "meal_times",
+        "weather_check_minutes": "weather_check_times",
+    }
+
     def __init__(self, config_file=None):
         """
         Initialise la configuration
@@ -32,75 +137,125 @@ class Settings:
         self.config_dir = self.base_dir / "config"
         
         # Fichier de configuration (par défaut ou personnalisé)
-        self.config_file = config_file or os.environ.get("ANGEL_CONFIG", str(self.config_dir / "default_settings.json"))
+        if config_file:
+            self.config_file = config_file
+        else:
+            _ensure_dotenv()
+            self.config_file = _ENV_SNAPSHOT["ANGEL_CONFIG"] or str(self.config_dir / "default_settings.json")
         self._load_config()
-        
-        # SECTION SERVER
-        self.host = self.config.get("server", {}).get("host", "127.0.0.1")
-        self.port = int(self.config.get("server", {}).get("port", 8000))
-        self.debug = self.config.get("server", {}).get("debug", False)
-        
-        # SECTION AVATAR
-        self.avatar_enabled = self.config.get("avatar", {}).get("enabled", True)
-        self.avatar_position = self.config.get("avatar", {}).get("position", "bottom-right")
-        self.avatar_size = self.config.get("avatar", {}).get("size", "medium")
-        
-        # SECTION ANGEL-SERVER-CAPTURE
-        self.angel_server_url = self.config.get("angel_server_capture", {}).get("url", "http://localhost:5000")
-        self.angel_server_key = self.config.get("angel_server_capture", {}).get("api_key", None)
-        self.polling_interval = int(self.config.get("angel_server_capture", {}).get("polling_interval", 10))
-        
-        # SECTION PRIORITIES
-        self.high_priority_duration = int(self.config.get("priorities", {}).get("high_priority_duration", 60))
-        self.medium_priority_duration = int(self.config.get("priorities", {}).get("medium_priority_duration", 300))
-        self.priority_thresholds = self.config.get("priorities", {}).get("thresholds", {
-            "high": 80,
-            "medium": 50,
-            "low": 20
-        })
-        
-        # SECTION RECOMMENDATIONS
-        self.medication_times = self.config.get("recommendations", {}).get("medication_times", ["08:00", "12:00", "18:00", "22:00"])
-        self.meal_times = self.config.get("recommendations", {}).get("meal_times", ["07:30", "12:30", "19:00"])
-        self.weather_check_times = self.config.get("recommendations", {}).get("weather_check_times", ["07:00", "12:00", "18:00"])
-        
-        # SECTION WEATHER
-        self.weather_api_key = self.config.get("weather", {}).get("api_key", os.getenv("WEATHER_API_KEY", ""))
-        self.weather_location = self.config.get("weather", {}).get("location", "Paris,FR")
-        
-        # SECTION NOTIFICATIONS
-        self.enable_desktop_notifications = self.config.get("notifications", {}).get("enable_desktop", True)
-        self.notification_sound = self.config.get("notifications", {}).get("sound", True)
-        self.notification_duration = int(self.config.get("notifications", {}).get("duration", 10))
-        
-        # SECTION INTRUSIVE_EVENTS
-        self.intrusive_events = self.config.get("intrusive_events", {
-            "whatsapp_call": True,
-            "phone_call": True,
-            "urgent_email": True,
-            "weather_alert": True,
-            "sms": True
-        })
-        
-        # Validation
-        self._validate_settings()
-    
+
+    def __getattr__(self, name):
+        """
+        Résout paresseusement un paramètre à son premier accès
+
+        Args:
+            name (str): Nom de l'attribut demandé
+
+        Returns:
+            Any: Valeur du paramètre (mise en cache dans l'instance)
+        """
+        base = self._DERIVED_MINUTES.get(name)
+        if base is not None:
+            value = [_to_minutes(t) for t in getattr(self, base)]
+            self.__dict__[name] = value
+            return value
+
+        try:
+            section, key, default = self._SECTION_MAP[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+        if key is None:
+            value = self.config.get(section, default)
+        else:
+            value = self.config.get(section, {}).get(key, default)
+
+        # La clé API météo peut aussi venir de l'environnement
+        if name == "weather_api_key" and not value:
+            _ensure_dotenv()
+            value = _ENV_SNAPSHOT["WEATHER_API_KEY"] or ""
+        # Conserver les conversions entières historiques (port, durées, ...)
+        elif isinstance(default, int) and not isinstance(default, bool) and value is not None:
+            value = int(value)
+
+        self.__dict__[name] = value
+        return value
+
+
     def _load_config(self):
-        """Charge la configuration depuis un fichier JSON"""
+        """Charge la configuration depuis un fichier JSON.
+
+        Le dictionnaire analysé est mis en cache sur disque en pickle, dans un
+        fichier nommé d'après la taille et la date de modification du JSON :
+        tant que celui-ci ne change pas, les démarrages suivants rechargent le
+        cache sans repasser par l'analyse JSON. Le JSON reste la source de
+        vérité, le cache n'est qu'un artefact régénérable.
+        """
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-                    logger.info(f"Configuration chargée depuis {self.config_file}")
-            else:
-                logger.warning(f"Fichier de configuration {self.config_file} non trouvé, utilisation des valeurs par défaut")
-                self.config = {}
+            # Un seul stat() : l'absence du fichier est traitée par
+            # l'exception plutôt que par un os.path.exists préalable
+            # (moitié moins de syscalls, et pas de fenêtre TOCTOU)
+            st = os.stat(self.config_file)
+        except FileNotFoundError:
+            logger.warning(f"Fichier de configuration {self.config_file} non trouvé, utilisation des valeurs par défaut")
+            self.config = {}
+            return
+
+        try:
+            cache_path = f"{self.config_file}.{st.st_mtime_ns}-{st.st_size}.pkl"
+
+            # Même principe pour le cache : tenter l'ouverture directement.
+            # Un cache illisible (tronqué, corrompu) est supprimé et on
+            # retombe sur l'analyse du JSON, qui reste la source de vérité
+            try:
+                with open(cache_path, 'rb') as f:
+                    self.config = pickle.load(f)
+                logger.info(f"Configuration chargée depuis le cache de {self.config_file}")
+                return
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Cache de configuration illisible, relecture du JSON: {e}")
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
+
+            with open(self.config_file, 'rb') as f:
+                data = f.read()
+            self.config = orjson.loads(data) if orjson is not None else json.loads(data)
+            logger.info(f"Configuration chargée depuis {self.config_file}")
+
+            self._write_config_cache(cache_path)
         except Exception as e:
             logger.error(f"Erreur lors du chargement de la configuration: {e}")
             self.config = {}
-    
-    def _validate_settings(self):
-        """Valide les paramètres de configuration"""
+
+    def _write_config_cache(self, cache_path):
+        """
+        Écrit le cache pickle de la configuration et purge les caches périmés
+
+        Args:
+            cache_path (str): Chemin du fichier de cache à écrire
+        """
+        try:
+            for stale in glob.glob(f"{glob.escape(self.config_file)}.*.pkl"):
+                if stale != cache_path:
+                    os.remove(stale)
+
+            # Écriture atomique (même idiome que save) : un crash en cours
+            # d'écriture ne peut pas laisser un cache tronqué en place
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self.config, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            # Le cache n'est qu'une optimisation : ne jamais faire échouer
+            # le chargement pour autant
+            logger.debug(f"Impossible d'écrire le cache de configuration: {e}")
+
+    def validate(self):
+        """Valide les paramètres de configuration (appelable à la demande)"""
         # Vérification de base pour s'assurer que les paramètres obligatoires sont présents
         if not self.angel_server_url:
             logger.warning("URL du serveur Angel non configurée")
@@ -157,12 +312,30 @@ class Settings:
         }
         
         try:
-            # Créer le répertoire parent si nécessaire
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4)
-            
+            # Créer le répertoire parent si nécessaire, sans repayer
+            # makedirs quand il existe déjà (cas de loin le plus courant)
+            save_dir = os.path.dirname(save_path) or '.'
+            if not os.path.isdir(save_dir):
+                os.makedirs(save_dir, exist_ok=True)
+
+            # Sérialiser d'abord en mémoire puis émettre un write() unique :
+            # json.dump écrivait la configuration en des centaines de petits
+            # morceaux, un syscall potentiel par fragment
+            if orjson is not None:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=4).encode('utf-8')
+
+            # Écriture atomique : fichier temporaire synchronisé sur disque
+            # puis renommage — un crash en cours d'écriture ne peut plus
+            # laisser une configuration tronquée
+            tmp_path = save_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, save_path)
+
             logger.info(f"Configuration sauvegardée dans {save_path}")
             return True
         except Exception as e:
@@ -8,17 +8,78 @@ Permet de récupérer les activités détectées et de proposer des activités.
 
 import asyncio
 import logging
-import json
 import time
+from bisect import bisect_right
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 import aiohttp
+import ijson
+import orjson
 
 from events.event_manager import EventManager
 from events.event_types import Event, EventType, EventPriority
 
 logger = logging.getLogger("angel.connectors.angel_server")
 
+# Lien local vers la méthode chaude : évite une double résolution
+# d'attributs par activité convertie
+_fromisoformat = datetime.fromisoformat
+
+# Seuils d'importance -> priorité : la recherche binaire remplace la chaîne
+# de comparaisons (importance < 40 : LOW, < 80 : MEDIUM, sinon HIGH)
+_PRIORITY_THRESHOLDS = (40, 80)
+_PRIORITIES = (EventPriority.LOW, EventPriority.MEDIUM, EventPriority.HIGH)
+
+
+class LazyJson:
+    """
+    Vue mapping paresseuse sur un objet JSON brut.
+
+    Conserve les octets d'origine et ne les décode qu'à la première lecture
+    d'un champ : une activité dont personne ne consulte les données ne paie
+    jamais la matérialisation du dictionnaire, et l'historique d'événements
+    retient des octets compacts plutôt qu'un arbre Python complet.
+    """
+
+    __slots__ = ('_raw', '_data')
+
+    def __init__(self, raw: bytes):
+        self._raw = raw
+        self._data = None
+
+    def _materialize(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = orjson.loads(self._raw)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __contains__(self, key):
+        return key in self._materialize()
+
+    def __iter__(self):
+        return iter(self._materialize())
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def get(self, key, default=None):
+        return self._materialize().get(key, default)
+
+    def keys(self):
+        return self._materialize().keys()
+
+    def values(self):
+        return self._materialize().values()
+
+    def items(self):
+        return self._materialize().items()
+
+    def __repr__(self):
+        return f"LazyJson({self._materialize()!r})"
+
+
 class AngelServerConnector:
     """
     Connecteur pour interagir avec le serveur Angel.
@@ -36,13 +97,30 @@ class AngelServerConnector:
         """
         self.server_url = server_url.rstrip('/')
         self.api_key = api_key
+
+        # En-têtes HTTP immuables, construits une seule fois : les rebâtir à
+        # chaque requête n'était que de l'allocation pure sous polling soutenu
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
         self.event_manager = event_manager
         self.session = None
         self.running = False
         self.poll_task = None
         self.last_activity_id = None
+
+        # ETag de la dernière réponse d'activités : permet au serveur de
+        # répondre 304 sans corps quand rien n'a changé
+        self._etag = None
+
+        # Le flux NDJSON est essayé en premier ; mémoriser son absence pour
+        # ne pas retenter une requête vouée au 404 à chaque itération
+        self._stream_supported = True
         
-        logger.info(f"Connecteur Angel Server initialisé: {self.server_url}")
+        logger.info("Connecteur Angel Server initialisé: %s", self.server_url)
     
     async def start(self):
         """Démarre le connecteur et initialise la session HTTP"""
@@ -52,13 +130,28 @@ class AngelServerConnector:
         
         logger.info("Démarrage du connecteur Angel Server")
         self.running = True
-        self.session = aiohttp.ClientSession()
+
+        # Connexions persistantes : keep-alive plus long que l'attente du
+        # long-polling, pool borné et cache DNS. En régime établi, plus
+        # aucune poignée de main TCP/TLS ni résolution DNS par requête, et
+        # les en-têtes par défaut sont posés une fois sur la session
+        connector = aiohttp.TCPConnector(
+            keepalive_timeout=75,
+            limit=8,
+            limit_per_host=4,
+            ttl_dns_cache=300
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self._headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
         
         # Vérifier la connexion au serveur
         try:
             await self._check_server_connection()
         except Exception as e:
-            logger.error(f"Erreur lors de la connexion au serveur Angel: {e}")
+            logger.error("Erreur lors de la connexion au serveur Angel: %s", e)
             await self.session.close()
             self.session = None
             self.running = False
@@ -103,82 +196,216 @@ class AngelServerConnector:
             raise Exception("Session HTTP non initialisée")
         
         try:
-            headers = self._get_headers()
-            async with self.session.get(f"{self.server_url}/api/status", headers=headers) as response:
+            async with self.session.get(f"{self.server_url}/api/status") as response:
                 if response.status != 200:
                     raise Exception(f"Erreur de connexion au serveur Angel: {response.status}")
                 
-                data = await response.json()
-                logger.info(f"Connexion au serveur Angel établie: {data.get('status', 'Inconnu')}")
+                data = orjson.loads(await response.read())
+                logger.info("Connexion au serveur Angel établie: %s", data.get('status', 'Inconnu'))
         except aiohttp.ClientError as e:
             raise Exception(f"Erreur de connexion au serveur Angel: {e}")
     
     async def _poll_activities(self):
         """
-        Récupère périodiquement les activités du serveur Angel
+        Reçoit les activités du serveur Angel en continu.
+
+        Essaie d'abord le flux NDJSON (push) ; si le serveur ne l'expose pas,
+        bascule sur du long-polling : le serveur retient la requête jusqu'à
+        l'arrivée d'une activité ou l'expiration du délai. Dans les deux cas,
+        plus aucune requête n'est émise à intervalle fixe — le coût réseau
+        devient proportionnel à l'activité réelle, et seul un repli avec
+        backoff exponentiel borné subsiste en cas d'échec de connexion.
         """
+        backoff = 1
         while self.running:
             try:
-                activities = await self.get_recent_activities()
-                
-                if activities:
-                    for activity in activities:
-                        # Convertir l'activité en événement et le publier
-                        event = self._activity_to_event(activity)
-                        await self.event_manager.publish(event)
-                        
-                        # Mettre à jour l'ID de la dernière activité
-                        if 'id' in activity:
-                            self.last_activity_id = activity['id']
-                
-                # Attendre avant la prochaine récupération
-                await asyncio.sleep(10)  # Polling toutes les 10 secondes
-            
+                if self._stream_supported:
+                    if not await self._stream_activities():
+                        self._stream_supported = False
+                        continue
+                else:
+                    started = time.monotonic()
+                    activities = await self.get_recent_activities(wait=60)
+
+                    if activities:
+                        # Publier le lot en une seule passe et ne mettre à
+                        # jour l'ID de dernière activité qu'une fois
+                        await self.event_manager.publish_many(
+                            [self._activity_to_event(a) for a in activities])
+
+                        ids = [a['id'] for a in activities if 'id' in a]
+                        if ids:
+                            self.last_activity_id = ids[-1]
+
+                    # Un retour vide quasi immédiat signale un serveur qui
+                    # n'honore pas l'attente (ou une erreur déjà journalisée) :
+                    # temporiser pour ne pas marteler l'endpoint
+                    if not activities and time.monotonic() - started < 1:
+                        await asyncio.sleep(backoff)
+                        backoff = min(backoff * 2, 30)
+                        continue
+
+                backoff = 1
+
             except asyncio.CancelledError:
                 logger.info("Récupération des activités annulée")
                 break
             except Exception as e:
-                logger.error(f"Erreur lors de la récupération des activités: {e}")
-                await asyncio.sleep(30)  # Attendre plus longtemps en cas d'erreur
-    
-    async def get_recent_activities(self) -> List[Dict[str, Any]]:
+                logger.error("Erreur lors de la récupération des activités: %s", e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def _stream_activities(self) -> bool:
+        """
+        Consomme le flux NDJSON d'activités du serveur
+
+        Returns:
+            bool: True si le serveur expose le flux, False s'il faut basculer
+                sur le long-polling
+        """
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=None)
+
+        async with self.session.get(
+            f"{self.server_url}/api/activities/stream",
+            timeout=timeout
+        ) as response:
+            if response.status == 404:
+                logger.info("Flux d'activités non disponible, bascule sur le long-polling")
+                return False
+
+            if response.status != 200:
+                raise Exception(f"Erreur du flux d'activités: {response.status}")
+
+            async for line in response.content:
+                if not self.running:
+                    break
+
+                line = line.strip()
+                if not line:
+                    continue
+
+                await self._publish_activity(orjson.loads(line), raw=line)
+
+        return True
+
+    async def _publish_activity(self, activity: Dict[str, Any], raw: Optional[bytes] = None):
+        """
+        Publie une activité sous forme d'événement interne
+
+        Args:
+            activity (Dict[str, Any]): Activité provenant du serveur Angel
+            raw (Optional[bytes], optional): Octets JSON d'origine de
+                l'activité. S'ils sont fournis, l'événement porte une vue
+                paresseuse sur ces octets et le dictionnaire décodé peut
+                être libéré aussitôt les champs scalaires extraits.
+                Defaults to None.
+        """
+        event = self._activity_to_event(activity)
+        if raw is not None:
+            event.data = LazyJson(raw)
+        await self.event_manager.publish(event)
+
+        # Mettre à jour l'ID de la dernière activité
+        if 'id' in activity:
+            self.last_activity_id = activity['id']
+
+    async def get_recent_activities(self, wait: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Récupère les activités récentes du serveur Angel
-        
+
+        Args:
+            wait (Optional[int], optional): Durée maximale (en secondes)
+                pendant laquelle le serveur peut retenir la requête en
+                attendant de nouvelles activités (long-polling). Defaults to None.
+
         Returns:
             List[Dict[str, Any]]: Liste des activités récentes
         """
         if not self.session:
             logger.error("Session HTTP non initialisée")
             return []
-        
+
         try:
-            headers = self._get_headers()
             params = {}
-            
+
             if self.last_activity_id:
                 params['since_id'] = self.last_activity_id
-            
+
+            # Requête conditionnelle : avec l'ETag de la réponse précédente,
+            # un serveur qui le gère répond 304 sans corps quand rien n'a
+            # changé — cas de loin le plus fréquent une fois since_id posé
+            headers = {'If-None-Match': self._etag} if self._etag else None
+
+            # Le délai de la session (30 s) est trop court pour une requête
+            # que le serveur peut retenir : l'élargir en conséquence
+            timeout = None
+            if wait:
+                params['wait'] = wait
+                timeout = aiohttp.ClientTimeout(total=wait + 15)
+
             async with self.session.get(
                 f"{self.server_url}/api/activities",
+                params=params,
                 headers=headers,
-                params=params
+                timeout=timeout
             ) as response:
+                # 204 : le long-polling a expiré sans nouvelle activité ;
+                # 304 : rien de neuf depuis l'ETag envoyé
+                if response.status in (204, 304):
+                    return []
+
                 if response.status != 200:
-                    logger.error(f"Erreur lors de la récupération des activités: {response.status}")
+                    logger.error("Erreur lors de la récupération des activités: %s", response.status)
                     return []
-                
-                data = await response.json()
-                return data.get('activities', [])
-        
+
+                self._etag = response.headers.get('ETag', self._etag)
+
+                # Corps vide annoncé ("{}") : inutile de lancer l'analyse
+                if int(response.headers.get('Content-Length', '-1')) in (0, 2):
+                    return []
+
+                # Analyse incrémentale : ijson consomme le corps morceau par
+                # morceau et émet chaque activité dès qu'elle est complète,
+                # sans jamais matérialiser les octets bruts de la réponse à
+                # côté de l'arbre JSON complet
+                return [activity async for activity in
+                        ijson.items(response.content, 'activities.item')]
+
         except aiohttp.ClientError as e:
-            logger.error(f"Erreur lors de la récupération des activités: {e}")
+            logger.error("Erreur lors de la récupération des activités: %s", e)
             return []
         except Exception as e:
-            logger.error(f"Erreur inattendue lors de la récupération des activités: {e}")
+            logger.error("Erreur inattendue lors de la récupération des activités: %s", e)
             return []
     
-    async def propose_activity(self, activity_type: str, description: str, 
+    async def refresh(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Récupère activités récentes et contexte utilisateur en parallèle
+
+        Les deux requêtes sont indépendantes : les lancer via asyncio.gather
+        ramène la latence d'un rafraîchissement à celle de la plus lente au
+        lieu de la somme des deux.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], Dict[str, Any]]: Activités récentes
+                et contexte utilisateur
+        """
+        activities, context = await asyncio.gather(
+            self.get_recent_activities(),
+            self.get_user_context(),
+            return_exceptions=True
+        )
+
+        # Les deux méthodes journalisent déjà leurs erreurs et retournent une
+        # valeur vide ; ne conserver ici que le même repli
+        if isinstance(activities, BaseException):
+            activities = []
+        if isinstance(context, BaseException):
+            context = {}
+
+        return activities, context
+
+    async def propose_activity(self, activity_type: str, description: str,
                               priority: EventPriority = EventPriority.MEDIUM,
                               metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
@@ -198,8 +425,6 @@ class AngelServerConnector:
             return False
         
         try:
-            headers = self._get_headers()
-            
             # Préparer les données de l'activité
             payload = {
                 "activity_type": activity_type,
@@ -209,25 +434,24 @@ class AngelServerConnector:
                 "metadata": metadata or {}
             }
             
-            # Envoyer la proposition d'activité
+            # Envoyer la proposition d'activité (sérialisée avec orjson ;
+            # le Content-Type JSON est déjà posé sur la session)
             async with self.session.post(
                 f"{self.server_url}/api/propose_activity",
-                headers=headers,
-                json=payload
+                data=orjson.dumps(payload)
             ) as response:
                 if response.status != 200 and response.status != 201:
-                    logger.error(f"Erreur lors de la proposition d'activité: {response.status}")
+                    logger.error("Erreur lors de la proposition d'activité: %s", response.status)
                     return False
                 
-                data = await response.json()
-                logger.info(f"Activité proposée avec succès: {activity_type}")
+                logger.info("Activité proposée avec succès: %s", activity_type)
                 return True
         
         except aiohttp.ClientError as e:
-            logger.error(f"Erreur lors de la proposition d'activité: {e}")
+            logger.error("Erreur lors de la proposition d'activité: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Erreur inattendue lors de la proposition d'activité: {e}")
+            logger.error("Erreur inattendue lors de la proposition d'activité: %s", e)
             return False
     
     async def get_user_context(self) -> Dict[str, Any]:
@@ -242,43 +466,29 @@ class AngelServerConnector:
             return {}
         
         try:
-            headers = self._get_headers()
-            
             async with self.session.get(
-                f"{self.server_url}/api/user_context",
-                headers=headers
+                f"{self.server_url}/api/user_context"
             ) as response:
                 if response.status != 200:
-                    logger.error(f"Erreur lors de la récupération du contexte utilisateur: {response.status}")
+                    logger.error("Erreur lors de la récupération du contexte utilisateur: %s", response.status)
                     return {}
                 
-                data = await response.json()
+                raw = await response.read()
+
+                # Court-circuit : corps vide ("{}"), rien à analyser
+                if len(raw) <= 2:
+                    return {}
+
+                data = orjson.loads(raw)
                 return data.get('context', {})
         
         except aiohttp.ClientError as e:
-            logger.error(f"Erreur lors de la récupération du contexte utilisateur: {e}")
+            logger.error("Erreur lors de la récupération du contexte utilisateur: %s", e)
             return {}
         except Exception as e:
-            logger.error(f"Erreur inattendue lors de la récupération du contexte utilisateur: {e}")
+            logger.error("Erreur inattendue lors de la récupération du contexte utilisateur: %s", e)
             return {}
     
-    def _get_headers(self) -> Dict[str, str]:
-        """
-        Construit les en-têtes HTTP pour les requêtes API
-        
-        Returns:
-            Dict[str, str]: En-têtes HTTP
-        """
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        
-        return headers
-    
     def _activity_to_event(self, activity: Dict[str, Any]) -> Event:
         """
         Convertit une activité du serveur Angel en événement interne
@@ -291,18 +501,18 @@ class AngelServerConnector:
         """
         # Déterminer la priorité en fonction du niveau d'importance de l'activité
         importance = activity.get('importance', 0)
-        priority = EventPriority.LOW
-        
-        if importance >= 80:
-            priority = EventPriority.HIGH
-        elif importance >= 40:
-            priority = EventPriority.MEDIUM
-        
+        priority = _PRIORITIES[bisect_right(_PRIORITY_THRESHOLDS, importance)]
+
+        # Ne parser le timestamp que s'il est fourni : sinon l'événement
+        # capture lui-même son instant de création (epoch flottant), sans
+        # allouer de datetime ici
+        ts = activity.get('timestamp')
+
         # Créer l'événement
         return Event(
             event_type=EventType.USER_ACTIVITY,
             priority=priority,
             source="angel_server",
-            timestamp=datetime.fromisoformat(activity.get('timestamp', datetime.now().isoformat())),
+            _timestamp=_fromisoformat(ts) if ts else None,
             data=activity
         )
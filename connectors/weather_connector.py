@@ -7,79 +7,195 @@ Permet de récupérer les prévisions météo actuelles et futures.
 """
 
 import asyncio
+import glob
+import json
 import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 
 import aiohttp
-import pyowm
-from pyowm.weatherapi25.weather import Weather
 
 from events.event_manager import EventManager
 from events.event_types import Event, EventType, EventPriority, IntrusiveEvents
 
 logger = logging.getLogger("angel.connectors.weather")
 
+# Base de l'API REST OpenWeatherMap, interrogée directement avec aiohttp :
+# tout reste sur la boucle asyncio, sans client synchrone ni thread dédié
+_OWM_BASE = "https://api.openweathermap.org"
+
+# Sentinelle retournée par _owm_get quand le serveur répond 304 : la donnée
+# n'a pas changé, la valeur déjà en cache reste valable
+_NOT_MODIFIED = object()
+
+# Durées de vie du cache mémoire, par type de donnée : la météo courante
+# bouge plus vite que les prévisions, les alertes entre les deux
+_TTL_CURRENT = 300    # 5 minutes
+_TTL_ALERTS = 600     # 10 minutes
+_TTL_FORECAST = 1800  # 30 minutes
+
+# Motifs de classification des alertes, compilés une seule fois à l'import :
+# la recherche devient un unique balayage du type d'alerte au lieu d'une
+# boucle Python de tests de sous-chaînes sur des listes reconstruites à
+# chaque appel
+_HIGH_SEVERITY_RE = re.compile(
+    "TORNADO|HURRICANE|TSUNAMI|EARTHQUAKE|FLOOD|THUNDERSTORM")
+_MEDIUM_SEVERITY_RE = re.compile(
+    "RAIN|WIND|SNOW|FOG|EXTREME_TEMPERATURE|COASTAL")
+
+# Mots-clés de conditions surveillés dans le statut détaillé : extraits en
+# un seul balayage compilé, puis comparés par opérations d'ensembles au
+# niveau C plutôt que par une batterie de tests de sous-chaînes
+_STATUS_KW_RE = re.compile(r"rain|shower|snow|thunder|storm")
+_RAIN_KW = frozenset(("rain", "shower"))
+_STORM_KW = frozenset(("thunder", "storm"))
+
 class WeatherConnector:
     """
     Connecteur pour les services météorologiques.
     Permet de récupérer les données météo et d'envoyer des alertes.
     """
-    
-    def __init__(self, api_key: str, location: str, event_manager: EventManager):
+
+    # Attributs figés : supprime le __dict__ par instance (moins de mémoire,
+    # accès aux attributs plus rapides sur les chemins chauds)
+    __slots__ = (
+        'api_key', 'location', '_city', '_country', '_query', 'event_manager',
+        'update_interval', 'min_update_interval', 'max_update_interval',
+        'session', '_wake', '_coords', 'running', 'update_task',
+        'last_weather', '_last_payload_hash', '_cache', '_inflight',
+        '_validators', 'cache_dir', '_executor'
+    )
+
+    def __init__(self, api_key: str, location: str, event_manager: EventManager,
+                 update_interval: int = 3600, min_update_interval: int = 600,
+                 max_update_interval: int = 21600,
+                 cache_dir: Optional[str] = None):
         """
         Initialise le connecteur météo
-        
+
         Args:
             api_key (str): Clé API pour le service météo
             location (str): Emplacement par défaut (ex: "Paris,FR")
             event_manager (EventManager): Gestionnaire d'événements
+            update_interval (int, optional): Intervalle nominal entre deux
+                mises à jour (en secondes). Defaults to 3600.
+            min_update_interval (int, optional): Plancher de l'intervalle
+                adaptatif. Defaults to 600.
+            max_update_interval (int, optional): Plafond de l'intervalle
+                adaptatif. Defaults to 21600.
+            cache_dir (Optional[str], optional): Répertoire où persister le
+                cache météo entre deux lancements. Defaults to None (pas de
+                persistance).
         """
         self.api_key = api_key
         self.location = location
+
+        # Emplacement normalisé une seule fois : ville et pays débarrassés
+        # des espaces parasites, la chaîne de requête API n'est plus jamais
+        # redécoupée ensuite
+        parts = [part.strip() for part in location.split(',')]
+        self._city = parts[0]
+        self._country = parts[1] if len(parts) > 1 else None
+        self._query = f"{self._city},{self._country}" if self._country else self._city
+
         self.event_manager = event_manager
-        self.owm = None if not api_key else pyowm.OWM(api_key)
+        self.update_interval = update_interval
+        self.min_update_interval = min_update_interval
+        self.max_update_interval = max_update_interval
+        self.session = None
+
+        # Événement de réveil : permet de forcer une mise à jour immédiate
+        # sans attendre la fin de l'intervalle en cours
+        self._wake = asyncio.Event()
+
+        # Coordonnées (lat, lon) de l'emplacement, résolues au premier
+        # besoin via l'API de géocodage puis réutilisées
+        self._coords = None
         self.running = False
         self.update_task = None
         self.last_weather = None
-        
-        logger.info(f"Connecteur météo initialisé pour l'emplacement: {self.location}")
-    
+
+        # Empreinte du dernier payload publié : évite de réveiller les
+        # abonnés pour une mise à jour strictement identique à la précédente
+        self._last_payload_hash = None
+
+        # Cache mémoire à TTL court : entre deux fenêtres, un appel revient
+        # à une lecture de dictionnaire au lieu d'un aller-retour HTTPS, et
+        # la consommation de quota API tombe à un appel par fenêtre
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+        # Requêtes en vol, par clé de cache : les appelants concurrents d'une
+        # même donnée attendent le même future au lieu de déclencher chacun
+        # leur propre appel réseau
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Validateurs HTTP (ETag / Last-Modified) par endpoint : permet des
+        # requêtes conditionnelles où un corps inchangé n'est ni retransmis
+        # ni réanalysé
+        self._validators: Dict[str, Dict[str, str]] = {}
+
+        # Persistance du cache sur disque : un redémarrage dans la fenêtre
+        # de validité resservira les dernières données sans toucher à l'API.
+        # Les écritures passent par un exécuteur dédié et borné plutôt que
+        # par l'exécuteur par défaut, partagé par tout le processus
+        self.cache_dir = cache_dir
+        self._executor = None
+        if cache_dir:
+            self._load_disk_cache()
+
+        logger.info("Connecteur météo initialisé pour l'emplacement: %s", self.location)
+
     async def start(self):
         """Démarre le connecteur météo"""
         if self.running:
             logger.warning("Le connecteur météo est déjà en cours d'exécution")
             return
-        
-        if not self.api_key or not self.owm:
+
+        if not self.api_key:
             logger.error("Impossible de démarrer le connecteur météo: clé API manquante")
             return
-        
+
         logger.info("Démarrage du connecteur météo")
         self.running = True
-        
+
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+
+        if self.cache_dir:
+            self._executor = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix='weather-io')
+
         # Effectuer une première mise à jour immédiate
         try:
-            weather = await self.get_current_weather()
+            weather = await self._refresh_all()
             if weather:
                 self.last_weather = weather
                 await self._publish_weather_update(weather)
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération initiale de la météo: {e}")
-        
+            logger.error("Erreur lors de la récupération initiale de la météo: %s", e)
+
         # Démarrer la tâche de mise à jour périodique
         self.update_task = asyncio.create_task(self._periodic_update())
         logger.info("Connecteur météo démarré")
-    
+
     async def stop(self):
         """Arrête le connecteur météo"""
         if not self.running:
             logger.warning("Le connecteur météo n'est pas en cours d'exécution")
             return
-        
+
         logger.info("Arrêt du connecteur météo")
         self.running = False
-        
+
+        # Réveiller la boucle périodique pour qu'elle constate l'arrêt sans
+        # attendre la fin de son intervalle (potentiellement plusieurs heures)
+        self._wake.set()
+
         # Annuler la tâche de mise à jour périodique
         if self.update_task and not self.update_task.done():
             self.update_task.cancel()
@@ -87,264 +203,482 @@ class WeatherConnector:
                 await self.update_task
             except asyncio.CancelledError:
                 pass
-        
+
+        # Fermer la session HTTP
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+        # Libérer l'exécuteur d'E/S disque sans attendre
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
         logger.info("Connecteur météo arrêté")
-    
+
+    async def _refresh_all(self) -> Optional[Dict[str, Any]]:
+        """
+        Rafraîchit météo courante, prévisions et alertes en parallèle
+
+        Les trois endpoints sont indépendants : les interroger sous
+        asyncio.gather ramène la durée d'une mise à jour complète à celle de
+        la requête la plus lente au lieu de la somme des trois, et laisse
+        les caches prévisions/alertes chauds pour les consommateurs aval.
+
+        Returns:
+            Optional[Dict[str, Any]]: Données météo actuelles
+        """
+        current, _forecast, _alerts = await asyncio.gather(
+            self.get_current_weather(),
+            self.get_forecast(3),
+            self.check_weather_alerts(),
+            return_exceptions=True
+        )
+
+        # Chaque méthode journalise déjà ses erreurs réseau ; ne retenir ici
+        # que l'absence de donnée
+        if isinstance(current, BaseException):
+            logger.error("Erreur lors du rafraîchissement météo: %s", current)
+            return None
+
+        return current
+
+    def refresh_now(self):
+        """Force une mise à jour immédiate sans attendre l'intervalle"""
+        self._wake.set()
+
     async def _periodic_update(self):
         """
-        Effectue des mises à jour périodiques de la météo
+        Effectue des mises à jour périodiques de la météo.
+
+        L'intervalle est adaptatif : il s'allonge de moitié (jusqu'au
+        plafond) quand rien ne change, et retombe près du plancher quand un
+        changement important est détecté — moins d'appels API par temps
+        stable, sans perte de réactivité par temps agité. Un réveil externe
+        (refresh_now) court-circuite l'attente en cours.
         """
-        # Mettre à jour toutes les heures
-        update_interval = 3600  # 1 heure en secondes
-        
+        interval = self.update_interval
+
         while self.running:
             try:
-                # Attendre avant la prochaine mise à jour
-                await asyncio.sleep(update_interval)
-                
-                # Récupérer la météo actuelle
-                weather = await self.get_current_weather()
+                # Attendre avant la prochaine mise à jour (ou un réveil forcé)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=interval)
+                    self._wake.clear()
+                    interval = self.update_interval
+                except asyncio.TimeoutError:
+                    pass
+
+                # Réveil déclenché par stop() : sortir immédiatement
+                if not self.running:
+                    break
+
+                # Récupérer la météo actuelle (et pré-chauffer les caches
+                # prévisions/alertes au passage)
+                weather = await self._refresh_all()
                 if weather:
                     old_weather = self.last_weather
                     self.last_weather = weather
-                    
+
                     # Publier la mise à jour météo
                     await self._publish_weather_update(weather)
-                    
+
                     # Vérifier s'il y a des conditions météo importantes à signaler
+                    important_change = False
                     if old_weather:
-                        await self._check_weather_changes(old_weather, weather)
-            
+                        important_change = await self._check_weather_changes(old_weather, weather)
+
+                    if important_change:
+                        interval = max(self.min_update_interval, self.update_interval // 4)
+                    else:
+                        interval = min(int(interval * 1.5), self.max_update_interval)
+
             except asyncio.CancelledError:
                 logger.info("Mise à jour météo périodique annulée")
                 break
             except Exception as e:
-                logger.error(f"Erreur lors de la mise à jour météo: {e}")
-                await asyncio.sleep(300)  # Attendre 5 minutes en cas d'erreur
-    
-    async def get_current_weather(self) -> Optional[Dict[str, Any]]:
+                logger.error("Erreur lors de la mise à jour météo: %s", e)
+                # Attendre 5 minutes en cas d'erreur, interruptible aussi
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=300)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _cached(self, key: str, ttl: float, coro_factory) -> Any:
         """
-        Récupère la météo actuelle
-        
+        Retourne la valeur en cache pour une clé, ou la rafraîchit
+
+        Args:
+            key (str): Clé de cache
+            ttl (float): Durée de validité de l'entrée (en secondes)
+            coro_factory (Callable): Fabrique de la coroutine de rafraîchissement
+
         Returns:
-            Optional[Dict[str, Any]]: Données météo actuelles
+            Any: Valeur en cache ou fraîchement récupérée
+        """
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        # Vol unique : si un rafraîchissement de cette clé est déjà en
+        # cours, attendre son résultat plutôt que d'en lancer un second
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await coro_factory()
+        except BaseException as e:
+            if not future.cancelled():
+                future.set_exception(e)
+                # Marquer l'exception comme consommée : sans attendeur
+                # concurrent, asyncio journaliserait sinon « Future exception
+                # was never retrieved » à chaque échec de récupération
+                future.exception()
+            raise
+        else:
+            # Réponse 304 : prolonger la durée de vie de la valeur en cache
+            if value is _NOT_MODIFIED:
+                value = entry[1] if entry is not None else None
+
+            self._cache[key] = (time.monotonic(), value)
+            future.set_result(value)
+
+            # Persister hors boucle : l'écriture disque part dans un thread
+            # et n'ajoute aucune latence à l'appelant
+            if self.cache_dir:
+                asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._write_disk_cache, key, value)
+
+            return value
+        finally:
+            del self._inflight[key]
+
+    def _load_disk_cache(self):
+        """Recharge les entrées de cache persistées lors d'un lancement précédent"""
+        try:
+            for path in glob.glob(os.path.join(self.cache_dir, "weather_*.json")):
+                with open(path, encoding='utf-8') as f:
+                    entry = json.load(f)
+
+                # Restituer l'âge réel de l'entrée sur l'horloge monotone :
+                # la validation par TTL de _cached s'applique ensuite telle
+                # quelle, par type de donnée
+                age = time.time() - entry['ts']
+                self._cache[entry['key']] = (time.monotonic() - age, entry['value'])
+        except Exception as e:
+            logger.debug("Impossible de recharger le cache météo: %s", e)
+
+    def _write_disk_cache(self, key: str, value: Any):
+        """
+        Persiste une entrée de cache sur disque (exécution synchrone)
+
+        Args:
+            key (str): Clé de cache
+            value (Any): Valeur à persister
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, f"weather_{key.replace(':', '_')}.json")
+
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'ts': time.time(), 'key': key, 'value': value}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Le cache n'est qu'une optimisation : ne jamais faire échouer
+            # un rafraîchissement pour autant
+            logger.debug("Impossible d'écrire le cache météo: %s", e)
+
+    async def _owm_get(self, path: str, params: Dict[str, Any]) -> Optional[Any]:
         """
-        if not self.owm:
+        Effectue une requête GET sur l'API OpenWeatherMap
+
+        Args:
+            path (str): Chemin de l'endpoint (ex: "/data/2.5/weather")
+            params (Dict[str, Any]): Paramètres de la requête (hors clé API)
+
+        Returns:
+            Optional[Any]: Corps JSON décodé, ou None en cas d'erreur
+        """
+        if not self.session:
             logger.error("Service météo non initialisé")
             return None
-        
+
         try:
-            # Utiliser un thread pour éviter de bloquer la boucle asyncio
-            loop = asyncio.get_running_loop()
-            weather = await loop.run_in_executor(None, self._fetch_weather)
-            
-            if not weather:
-                return None
-            
-            # Convertir l'objet Weather en dictionnaire
-            return {
-                'temperature': weather.temperature('celsius'),
-                'status': weather.status,
-                'detailed_status': weather.detailed_status,
-                'wind': weather.wind(),
-                'humidity': weather.humidity,
-                'rain': weather.rain,
-                'snow': weather.snow,
-                'clouds': weather.clouds,
-                'reference_time': weather.ref_time,
-                'timestamp': datetime.now().isoformat()
-            }
-        
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération de la météo: {e}")
+            params = {**params, 'appid': self.api_key}
+            async with self.session.get(
+                f"{_OWM_BASE}{path}",
+                params=params,
+                headers=self._validators.get(path)
+            ) as response:
+                # 304 : corps identique à la réponse précédente, rien à
+                # transférer ni à analyser
+                if response.status == 304:
+                    return _NOT_MODIFIED
+
+                if response.status != 200:
+                    logger.error("Erreur de l'API météo (%s): %s", path, response.status)
+                    return None
+
+                # Mémoriser les validateurs pour la prochaine requête
+                validators = {}
+                etag = response.headers.get('ETag')
+                if etag:
+                    validators['If-None-Match'] = etag
+                last_modified = response.headers.get('Last-Modified')
+                if last_modified:
+                    validators['If-Modified-Since'] = last_modified
+                if validators:
+                    self._validators[path] = validators
+
+                return await response.json()
+
+        except aiohttp.ClientError as e:
+            logger.error("Erreur lors de la requête météo (%s): %s", path, e)
             return None
-    
-    def _fetch_weather(self) -> Optional[Weather]:
+
+    def _format_weather(self, entry: Dict[str, Any], timestamp: Optional[float] = None,
+                        verbose: bool = False) -> Dict[str, Any]:
         """
-        Récupère les données météo depuis l'API OWM (exécution synchrone)
-        
+        Convertit une entrée JSON de l'API OWM au format interne
+
+        Par défaut, seuls les champs réellement lus par les consommateurs
+        (détection de changements, publication, avatar) sont conservés :
+        chaque événement publié transporte et sérialise d'autant moins.
+
+        Args:
+            entry (Dict[str, Any]): Entrée météo brute de l'API
+            timestamp (Optional[float], optional): Horodatage epoch à
+                associer. Defaults to None (heure courante).
+            verbose (bool, optional): Inclure aussi les champs secondaires
+                (pluie, neige, nuages...). Defaults to False.
+
         Returns:
-            Optional[Weather]: Objet Weather ou None en cas d'erreur
+            Dict[str, Any]: Données météo au format interne
         """
-        try:
-            mgr = self.owm.weather_manager()
-            observation = mgr.weather_at_place(self.location)
-            return observation.weather
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des données météo: {e}")
+        main = entry.get('main', {})
+        conditions = entry.get('weather') or [{}]
+
+        data = {
+            'temperature': {
+                'temp': main.get('temp'),
+                'temp_min': main.get('temp_min'),
+                'temp_max': main.get('temp_max'),
+                'feels_like': main.get('feels_like')
+            },
+            'status': conditions[0].get('main', ''),
+            'detailed_status': conditions[0].get('description', ''),
+            'wind': entry.get('wind', {}),
+            'humidity': main.get('humidity'),
+            # Epoch en secondes : bien moins cher qu'un datetime fraîchement
+            # alloué puis formaté en ISO-8601 à chaque mise à jour
+            'timestamp': timestamp if timestamp is not None else time.time()
+        }
+
+        if verbose:
+            data.update({
+                'rain': entry.get('rain', {}),
+                'snow': entry.get('snow', {}),
+                'clouds': entry.get('clouds', {}).get('all'),
+                'reference_time': entry.get('dt')
+            })
+
+        return data
+
+    async def _resolve_coords(self) -> Optional[Tuple[float, float]]:
+        """
+        Résout l'emplacement en coordonnées (lat, lon) via le géocodage
+
+        Returns:
+            Optional[Tuple[float, float]]: Coordonnées, ou None si introuvable
+        """
+        if self._coords is None:
+            data = await self._owm_get("/geo/1.0/direct", {'q': self._query, 'limit': 1})
+
+            if not data or data is _NOT_MODIFIED:
+                logger.error("Emplacement non trouvé: %s", self.location)
+                return None
+
+            self._coords = (data[0]['lat'], data[0]['lon'])
+
+        return self._coords
+
+    async def get_current_weather(self, verbose: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Récupère la météo actuelle (mise en cache pendant 5 minutes)
+
+        Args:
+            verbose (bool, optional): Inclure les champs secondaires
+                (endpoints d'administration/debug). Defaults to False.
+
+        Returns:
+            Optional[Dict[str, Any]]: Données météo actuelles
+        """
+        if verbose:
+            return await self._cached('current:full', _TTL_CURRENT,
+                                      lambda: self._refresh_current_weather(True))
+        return await self._cached('current', _TTL_CURRENT, self._refresh_current_weather)
+
+    async def _refresh_current_weather(self, verbose: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Récupère la météo actuelle auprès du service (sans cache)
+
+        Args:
+            verbose (bool, optional): Inclure les champs secondaires.
+                Defaults to False.
+
+        Returns:
+            Optional[Dict[str, Any]]: Données météo actuelles
+        """
+        data = await self._owm_get("/data/2.5/weather", {'q': self._query, 'units': 'metric'})
+
+        if data is _NOT_MODIFIED:
+            return _NOT_MODIFIED
+
+        if not data:
             return None
-    
+
+        return self._format_weather(data, verbose=verbose)
+
     async def get_forecast(self, days: int = 3) -> List[Dict[str, Any]]:
         """
-        Récupère les prévisions météo pour les prochains jours
-        
+        Récupère les prévisions météo (mises en cache pendant 30 minutes)
+
         Args:
             days (int, optional): Nombre de jours de prévision. Defaults to 3.
-            
+
         Returns:
             List[Dict[str, Any]]: Prévisions météo
         """
-        if not self.owm:
-            logger.error("Service météo non initialisé")
-            return []
-        
-        try:
-            # Utiliser un thread pour éviter de bloquer la boucle asyncio
-            loop = asyncio.get_running_loop()
-            forecast = await loop.run_in_executor(None, lambda: self._fetch_forecast(days))
-            
-            # Convertir les prévisions en format utilisable
-            result = []
-            for item in forecast:
-                result.append({
-                    'temperature': item.temperature('celsius'),
-                    'status': item.status,
-                    'detailed_status': item.detailed_status,
-                    'wind': item.wind(),
-                    'humidity': item.humidity,
-                    'rain': item.rain,
-                    'snow': item.snow,
-                    'clouds': item.clouds,
-                    'reference_time': item.ref_time,
-                    'timestamp': datetime.fromtimestamp(item.ref_time).isoformat()
-                })
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des prévisions: {e}")
-            return []
-    
-    def _fetch_forecast(self, days: int) -> List[Weather]:
+        return await self._cached(f'forecast:{days}', _TTL_FORECAST,
+                                  lambda: self._refresh_forecast(days))
+
+    async def _refresh_forecast(self, days: int) -> List[Dict[str, Any]]:
         """
-        Récupère les prévisions météo depuis l'API OWM (exécution synchrone)
-        
+        Récupère les prévisions météo auprès du service (sans cache)
+
         Args:
             days (int): Nombre de jours de prévision
-            
+
         Returns:
-            List[Weather]: Liste d'objets Weather
+            List[Dict[str, Any]]: Prévisions météo
         """
-        try:
-            mgr = self.owm.weather_manager()
-            forecaster = mgr.forecast_at_place(self.location, '3h')
-            forecast = forecaster.forecast
-            
-            # Limiter les prévisions à la période demandée
-            limit_time = datetime.now() + timedelta(days=days)
-            limit_timestamp = limit_time.timestamp()
-            
-            # Extraire les prévisions
-            result = []
-            for weather in forecast:
-                if weather.ref_time <= limit_timestamp:
-                    result.append(weather)
-            
-            return result
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des prévisions météo: {e}")
+        data = await self._owm_get("/data/2.5/forecast", {'q': self._query, 'units': 'metric'})
+
+        if data is _NOT_MODIFIED:
+            return _NOT_MODIFIED
+
+        if not data:
             return []
-    
+
+        # Limiter les prévisions (par pas de 3 h) à la période demandée
+        limit_timestamp = (datetime.now() + timedelta(days=days)).timestamp()
+
+        return [
+            self._format_weather(item, item['dt'])
+            for item in data.get('list', [])
+            if item.get('dt', 0) <= limit_timestamp
+        ]
+
     async def check_weather_alerts(self) -> List[Dict[str, Any]]:
         """
-        Vérifie s'il y a des alertes météo pour l'emplacement actuel
-        
+        Vérifie les alertes météo (mises en cache pendant 10 minutes)
+
         Returns:
             List[Dict[str, Any]]: Liste des alertes météo
         """
-        if not self.owm:
-            logger.error("Service météo non initialisé")
-            return []
-        
-        try:
-            # Utiliser un thread pour éviter de bloquer la boucle asyncio
-            loop = asyncio.get_running_loop()
-            alerts = await loop.run_in_executor(None, self._fetch_alerts)
-            
-            return alerts
-        
-        except Exception as e:
-            logger.error(f"Erreur lors de la vérification des alertes météo: {e}")
-            return []
-    
-    def _fetch_alerts(self) -> List[Dict[str, Any]]:
+        return await self._cached('alerts', _TTL_ALERTS, self._refresh_alerts)
+
+    async def _refresh_alerts(self) -> List[Dict[str, Any]]:
         """
-        Récupère les alertes météo depuis l'API OWM (exécution synchrone)
-        
+        Vérifie s'il y a des alertes météo pour l'emplacement actuel
+
         Returns:
             List[Dict[str, Any]]: Liste des alertes météo
         """
-        try:
-            mgr = self.owm.weather_manager()
-            # Extraire la latitude et longitude depuis le nom de l'emplacement
-            reg = self.owm.city_id_registry()
-            locations = reg.locations_for(self.location.split(',')[0], country=self.location.split(',')[1] if ',' in self.location else None)
-            
-            if not locations:
-                logger.error(f"Emplacement non trouvé: {self.location}")
-                return []
-            
-            lat, lon = locations[0].lat, locations[0].lon
-            
-            # Récupérer les alertes
-            alerts = mgr.weather_alerts_manager().get_alerts((lon, lat))
-            
-            # Formater les alertes
-            result = []
-            for alert in alerts.alerts:
-                result.append({
-                    'sender': alert.sender_name,
-                    'event': alert.type,
-                    'description': alert.description,
-                    'start': datetime.fromtimestamp(alert.start).isoformat(),
-                    'end': datetime.fromtimestamp(alert.end).isoformat(),
-                    'severity': self._get_alert_severity(alert.type)
-                })
-            
-            return result
-        
-        except Exception as e:
-            logger.error(f"Erreur lors de la récupération des alertes météo: {e}")
+        coords = await self._resolve_coords()
+        if coords is None:
+            return []
+
+        lat, lon = coords
+        data = await self._owm_get("/data/2.5/onecall", {
+            'lat': lat,
+            'lon': lon,
+            'exclude': 'current,minutely,hourly,daily',
+            'units': 'metric'
+        })
+
+        if data is _NOT_MODIFIED:
+            return _NOT_MODIFIED
+
+        if not data:
             return []
-    
+
+        # Formater les alertes
+        result = []
+        for alert in data.get('alerts', []):
+            result.append({
+                'sender': alert.get('sender_name', ''),
+                'event': alert.get('event', ''),
+                'description': alert.get('description', ''),
+                'start': datetime.fromtimestamp(alert.get('start', 0)).isoformat(),
+                'end': datetime.fromtimestamp(alert.get('end', 0)).isoformat(),
+                'severity': self._get_alert_severity(alert.get('event', ''))
+            })
+
+        return result
+
     def _get_alert_severity(self, alert_type: str) -> int:
         """
         Détermine la gravité d'une alerte météo
-        
+
         Args:
             alert_type (str): Type d'alerte
-            
+
         Returns:
             int: Niveau de gravité (1-3)
         """
-        # Alertes de haute gravité
-        high_severity = ["TORNADO", "HURRICANE", "TSUNAMI", "EARTHQUAKE", "FLOOD", "THUNDERSTORM"]
-        
-        # Alertes de gravité moyenne
-        medium_severity = ["RAIN", "WIND", "SNOW", "FOG", "EXTREME_TEMPERATURE", "COASTAL"]
-        
         # Normaliser le type d'alerte
         normalized_type = alert_type.upper().strip()
-        
+
         # Vérifier la gravité
-        for alert in high_severity:
-            if alert in normalized_type:
-                return 3
-        
-        for alert in medium_severity:
-            if alert in normalized_type:
-                return 2
-        
+        if _HIGH_SEVERITY_RE.search(normalized_type):
+            return 3
+
+        if _MEDIUM_SEVERITY_RE.search(normalized_type):
+            return 2
+
         # Par défaut, gravité faible
         return 1
-    
+
     async def _publish_weather_update(self, weather: Dict[str, Any]):
         """
         Publie une mise à jour météo
-        
+
         Args:
             weather (Dict[str, Any]): Données météo
         """
+        # Ne publier que si la partie significative du payload a changé :
+        # un payload identique ne ferait que re-déclencher les abonnés
+        # (re-rendu de l'avatar, etc.) pour rien
+        temp = weather['temperature'].get('temp')
+        wind = weather.get('wind') or {}
+        payload_hash = hash((
+            weather.get('status'),
+            round(temp) if temp is not None else None,
+            weather.get('humidity'),
+            round(wind.get('speed') or 0)
+        ))
+
+        if payload_hash == self._last_payload_hash:
+            logger.debug("Mise à jour météo identique à la précédente, non publiée")
+            return
+
+        self._last_payload_hash = payload_hash
+
         # Créer un événement de mise à jour météo
         event = Event(
             event_type=EventType.WEATHER_UPDATE,
@@ -352,53 +686,63 @@ class WeatherConnector:
             source="weather_service",
             data=weather
         )
-        
+
         # Publier l'événement
         await self.event_manager.publish(event)
-        logger.debug(f"Mise à jour météo publiée: {weather['status']}")
-    
-    async def _check_weather_changes(self, old_weather: Dict[str, Any], new_weather: Dict[str, Any]):
+        logger.debug("Mise à jour météo publiée: %s", weather['status'])
+
+    async def _check_weather_changes(self, old_weather: Dict[str, Any], new_weather: Dict[str, Any]) -> bool:
         """
         Vérifie s'il y a des changements importants dans la météo
-        
+
         Args:
             old_weather (Dict[str, Any]): Ancienne météo
             new_weather (Dict[str, Any]): Nouvelle météo
+
+        Returns:
+            bool: True si un changement important a été détecté et publié
         """
-        # Vérifier les changements de conditions météorologiques
-        old_status = old_weather['detailed_status'].lower()
-        new_status = new_weather['detailed_status'].lower()
-        
+        # Court-circuit du cas de loin le plus fréquent : statut identique
+        # et température stable, aucun des tests ci-dessous ne peut se
+        # déclencher
+        if (old_weather['detailed_status'] == new_weather['detailed_status']
+                and abs(new_weather['temperature']['temp'] - old_weather['temperature']['temp']) <= 10):
+            return False
+
+        # Extraire les mots-clés de condition des deux statuts en une passe
+        old_kw = set(_STATUS_KW_RE.findall(old_weather['detailed_status'].lower()))
+        new_kw = set(_STATUS_KW_RE.findall(new_weather['detailed_status'].lower()))
+
         # Déterminer si un changement important s'est produit
         important_change = False
         alert_type = None
         description = None
         severity = 1
-        
+
         # Changements liés à la pluie
-        if ('rain' in new_status or 'shower' in new_status) and not ('rain' in old_status or 'shower' in old_status):
+        if (_RAIN_KW & new_kw) and not (_RAIN_KW & old_kw):
             important_change = True
             alert_type = "RAIN_STARTING"
             description = "La pluie va commencer prochainement"
-        
+
         # Changements liés à la neige
-        elif 'snow' in new_status and not 'snow' in old_status:
+        elif 'snow' in new_kw and 'snow' not in old_kw:
             important_change = True
             alert_type = "SNOW_STARTING"
             description = "De la neige est prévue prochainement"
             severity = 2
-        
+
         # Changements liés aux orages
-        elif ('thunder' in new_status or 'storm' in new_status) and not ('thunder' in old_status or 'storm' in old_status):
+        elif (_STORM_KW & new_kw) and not (_STORM_KW & old_kw):
             important_change = True
             alert_type = "THUNDERSTORM_STARTING"
             description = "Des orages sont prévus prochainement"
             severity = 2
-        
+
         # Changements de température importants
         old_temp = old_weather['temperature']['temp']
         new_temp = new_weather['temperature']['temp']
-        
+
         if abs(new_temp - old_temp) > 10:  # Changement de plus de 10°C
             important_change = True
             if new_temp > old_temp:
@@ -407,14 +751,16 @@ class WeatherConnector:
             else:
                 alert_type = "TEMPERATURE_DROP"
                 description = f"Baisse importante de la température: {int(old_temp)}°C → {int(new_temp)}°C"
-            
+
             severity = 2 if abs(new_temp - old_temp) > 15 else 1
-        
+
         # Si un changement important est détecté, envoyer une alerte
         if important_change and alert_type and description:
             # Créer un événement d'alerte météo
             event = IntrusiveEvents.weather_alert(alert_type, description, severity)
-            
+
             # Publier l'événement
             await self.event_manager.publish(event)
-            logger.info(f"Alerte météo publiée: {alert_type} - {description}")
+            logger.info("Alerte météo publiée: %s - %s", alert_type, description)
+
+        return important_change
@@ -20,12 +20,31 @@ from api.api_server import ApiServer
 
 logger = logging.getLogger("angel.core")
 
+# uvloop (implémentation libuv de la boucle asyncio) accélère sensiblement
+# les E/S réseau de tous les connecteurs sans changer une ligne de code.
+# Purement optionnel : la boucle standard reste utilisée s'il n'est pas
+# installé (Windows notamment), et la boucle Qt de qasync — créée
+# explicitement dans main.py quand l'avatar est activé — ignore cette
+# politique
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 class AppManager:
     """
     Gestionnaire principal de l'application.
     Coordonne tous les services et composants.
     """
-    
+
+    # Attributs figés : supprime le __dict__ par instance
+    __slots__ = (
+        'settings', 'event_manager', 'angel_connector',
+        'recommendation_engine', 'avatar_controller', 'api_server',
+        'running', 'tasks'
+    )
+
     def __init__(self, settings: Settings):
         """
         Initialise le gestionnaire d'application
@@ -75,19 +94,21 @@ class AppManager:
         logger.info("Démarrage de l'application...")
         self.running = True
         
-        # Démarrer le gestionnaire d'événements
+        # Démarrer le gestionnaire d'événements en premier : c'est le seul
+        # prérequis des autres sous-systèmes
         await self.event_manager.start()
-        
-        # Démarrer le connecteur au serveur Angel
-        await self.angel_connector.start()
-        
-        # Démarrer le moteur de recommandations
-        await self.recommendation_engine.start()
-        
-        # Démarrer le contrôleur d'avatar si activé
+
+        # Les sous-systèmes restants sont indépendants entre eux : les
+        # démarrer en parallèle ramène le temps de démarrage au plus lent
+        # d'entre eux au lieu de leur somme
+        startups = [
+            self.angel_connector.start(),
+            self.recommendation_engine.start()
+        ]
         if self.avatar_controller:
-            await self.avatar_controller.start()
-        
+            startups.append(self.avatar_controller.start())
+        await asyncio.gather(*startups)
+
         # Démarrer le serveur API
         self.tasks.append(asyncio.create_task(self.api_server.start()))
         
@@ -104,34 +125,34 @@ class AppManager:
         
         # Arrêter le serveur API
         await self.api_server.stop()
-        
-        # Arrêter le contrôleur d'avatar si activé
+
+        # Arrêter les sous-systèmes indépendants en parallèle (symétrique
+        # du démarrage)
+        shutdowns = [
+            self.recommendation_engine.stop(),
+            self.angel_connector.stop()
+        ]
         if self.avatar_controller:
-            await self.avatar_controller.stop()
-        
-        # Arrêter le moteur de recommandations
-        await self.recommendation_engine.stop()
-        
-        # Arrêter le connecteur au serveur Angel
-        await self.angel_connector.stop()
-        
-        # Arrêter le gestionnaire d'événements
+            shutdowns.append(self.avatar_controller.stop())
+        await asyncio.gather(*shutdowns)
+
+        # Arrêter le gestionnaire d'événements en dernier : les autres
+        # peuvent encore publier pendant leur arrêt
         await self.event_manager.stop()
         
-        # Annuler toutes les tâches en cours
+        # Annuler toutes les tâches en cours d'un bloc, puis les collecter
+        # en parallèle : l'attente dure le temps de la tâche la plus lente
+        # à se terminer au lieu de la somme des annulations séquentielles
         for task in self.tasks:
             if not task.done():
                 task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-        
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
         logger.info("Application arrêtée avec succès")
     
     async def restart(self):
         """Redémarre l'application"""
         logger.info("Redémarrage de l'application...")
         await self.stop()
-        await asyncio.sleep(1)  # Attendre un peu pour s'assurer que tout est bien arrêté
         await self.start()
@@ -6,8 +6,11 @@ Moteur de recommandations qui analyse le contexte et propose des activités adap
 """
 
 import asyncio
+import collections
+import heapq
 import logging
 import random
+import time as time_module
 from datetime import datetime, time, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Set
 
@@ -18,6 +21,66 @@ from connectors.angel_server_connector import AngelServerConnector
 
 logger = logging.getLogger("angel.decision")
 
+# Libellé par défaut des correspondants inconnus, partagé par tous les
+# gestionnaires de communication
+_UNKNOWN_CONTACT = "Quelqu'un"
+
+# Sentinelle "jamais envoyée" pour _can_send_recommendation : -inf rend la
+# soustraction d'instants monotones toujours gagnante, sans second test
+# d'appartenance (0.0 serait incorrect juste après le démarrage du système,
+# l'horloge monotone pouvant partir de presque zéro)
+_NEVER_SENT = float('-inf')
+
+# Suggestions d'activités intérieures, construites une seule fois au lieu
+# de recréer la liste à chaque événement d'inactivité
+_INDOOR_ACTIVITIES = (
+    "lire un livre",
+    "regarder un film",
+    "cuisiner quelque chose de nouveau",
+    "appeler un ami",
+    "faire un peu de rangement"
+)
+
+# Déclencheurs météo par mot-clé du statut : le premier trouvé l'emporte.
+# Une seule passe sur la table remplace la cascade de branches dupliquant
+# l'appel à _create_recommendation
+_RAIN_MESSAGE = "Il pleut actuellement. N'oubliez pas votre parapluie si vous sortez."
+_WEATHER_STATUS_TRIGGERS = (
+    ('rain', _RAIN_MESSAGE),
+    ('shower', _RAIN_MESSAGE),
+    ('snow', "Il neige actuellement. Habillez-vous chaudement si vous sortez."),
+)
+
+# Seuils de température : (prédicat, gabarit de message), évalués si aucun
+# mot-clé de statut n'a déclenché
+_WEATHER_TEMP_TRIGGERS = (
+    (lambda t: t < 5, "Il fait très froid actuellement ({temp:.1f}°C). Habillez-vous chaudement si vous sortez."),
+    (lambda t: t > 30, "Il fait très chaud actuellement ({temp:.1f}°C). Pensez à bien vous hydrater."),
+)
+
+
+def _build_minute_index(slots, window):
+    """
+    Construit un index minute de la journée -> créneau couvrant cette minute
+
+    Chaque créneau couvre une fenêtre de ± window minutes autour de son
+    heure : les vérifications deviennent une simple recherche de dictionnaire
+    en O(1) au lieu de parcourir tous les créneaux configurés.
+
+    Args:
+        slots (List[Tuple[str, time]]): Paires (chaîne "HH:MM", objet time)
+        window (int): Demi-fenêtre de couverture en minutes
+
+    Returns:
+        Dict[int, Tuple[str, time]]: Créneau par minute de la journée couverte
+    """
+    index = {}
+    for time_str, slot_time in slots:
+        center = slot_time.hour * 60 + slot_time.minute
+        for offset in range(-window, window + 1):
+            index.setdefault((center + offset) % 1440, (time_str, slot_time))
+    return index
+
 class RecommendationEngine:
     """
     Moteur de recommandations qui propose des activités adaptées au contexte.
@@ -35,10 +98,25 @@ class RecommendationEngine:
         self.settings = settings
         self.running = False
         self.tasks = []
-        
-        # Contexte actuel
+
+        # Tas des prochaines échéances de vérification et TimerHandle du
+        # réveil armé sur la boucle (cf. _schedule_periodic_checks)
+        self._check_heap = []
+        self._check_handle = None
+
+        # Suivi d'état pour le ménage périodique : ne travailler que si des
+        # activités sont arrivées depuis le dernier passage ou si l'heure a
+        # changé (le tick de 5 minutes est le plus souvent un non-événement)
+        self._activities_dirty = False
+        self._last_hour_bucket = None
+        
+        # Contexte actuel. Les activités arrivent en ordre quasi
+        # chronologique : une deque permet d'évincer les plus anciennes par
+        # la gauche en O(1) au lieu de reconstruire une liste entière. Le
+        # maxlen borne la mémoire en cas de rafale d'événements entre deux
+        # nettoyages : les plus anciennes sont écrasées automatiquement
         self.current_context = {
-            'activities': [],           # Activités récentes de l'utilisateur
+            'activities': collections.deque(maxlen=settings.max_recent_activities),
             'weather': None,            # Météo actuelle
             'weather_forecast': None,   # Prévisions météo
             'time_of_day': None,        # Période de la journée (matin, midi, soir, nuit)
@@ -54,14 +132,49 @@ class RecommendationEngine:
             'activity': 60,    # 1 heure
             'weather': 180     # 3 heures
         }
+        # Forme en secondes, précalculée pour _can_send_recommendation qui
+        # compare des instants monotones (flottants) sur le chemin chaud
+        self._intervals_sec = {k: v * 60 for k, v in self.recommendation_intervals.items()}
         
         # S'abonner aux événements pertinents
         self.event_manager.subscribe(EventType.USER_ACTIVITY, self._handle_user_activity)
         self.event_manager.subscribe(EventType.WEATHER_UPDATE, self._handle_weather_update)
         self.event_manager.subscribe_to_priority(EventPriority.HIGH, self._handle_high_priority)
         
-        # Variables pour le contrôle des tâches planifiées
-        self.scheduled_tasks = {}
+        # Recommandations accumulées pendant un même réveil, publiées en un
+        # seul appel groupé à la fin du traitement (cf. _flush_pending)
+        self._pending_events = []
+
+        # Table de répartition des événements haute priorité : une recherche
+        # de dictionnaire remplace la chaîne de elif dans _handle_high_priority
+        self._high_prio_handlers = {
+            EventType.WHATSAPP_CALL: self._on_whatsapp_call,
+            EventType.PHONE_CALL: self._on_phone_call,
+            EventType.SMS_RECEIVED: self._on_sms_received,
+            EventType.EMAIL_RECEIVED: self._on_email_received,
+            EventType.WEATHER_ALERT: self._on_weather_alert,
+        }
+
+        # Horaires pré-analysés une seule fois au démarrage : paires
+        # (chaîne "HH:MM" d'origine, objet time). Les vérifications répétées
+        # font un datetime.combine direct au lieu de re-découper les chaînes
+        # à chaque déclenchement. Les minutes depuis minuit dérivées par
+        # Settings évitent même le découpage initial
+        self._med_times = tuple((s, time(*divmod(m, 60)))
+                                for s, m in zip(settings.medication_times, settings.medication_minutes))
+        self._meal_times = tuple((s, time(*divmod(m, 60)))
+                                 for s, m in zip(settings.meal_times, settings.meal_minutes))
+        self._weather_times = tuple((s, time(*divmod(m, 60)))
+                                    for s, m in zip(settings.weather_check_times, settings.weather_check_minutes))
+
+        # Index par minute de la journée : les vérifications "sommes-nous
+        # dans la fenêtre d'un créneau ?" se font en une recherche de
+        # dictionnaire. Ceci compte surtout pour le chemin des activités
+        # utilisateur, exécuté à chaque événement et pas seulement aux
+        # déclenchements planifiés (fenêtre de 60 min pour ce cas)
+        self._med_slot_by_minute = _build_minute_index(self._med_times, 30)
+        self._meal_slot_by_minute = _build_minute_index(self._meal_times, 30)
+        self._med_meal_slot_by_minute = _build_minute_index(self._med_times, 60)
         
         logger.info("Moteur de recommandations initialisé")
     
@@ -73,13 +186,31 @@ class RecommendationEngine:
         
         logger.info("Démarrage du moteur de recommandations")
         self.running = True
-        
+
+        # Python 3.12+ : la fabrique de tâches "eager" exécute chaque
+        # coroutine jusqu'à sa première suspension avant de créer la tâche.
+        # Les chemins qui retournent tôt (gardes _can_send_recommendation,
+        # files vides) évitent ainsi un aller-retour complet par la boucle
+        eager_factory = getattr(asyncio, 'eager_task_factory', None)
+        if eager_factory is not None:
+            asyncio.get_running_loop().set_task_factory(eager_factory)
+
+        # En mode debug, activer le mode debug de la boucle et signaler tout
+        # rappel qui la monopolise plus de 50 ms : le seuil par défaut de
+        # 100 ms laisse passer des blocages déjà perceptibles sur les chemins
+        # de dispatch d'événements
+        if self.settings.debug:
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = 0.05
+
         # Démarrer la tâche de mise à jour du contexte
         self.tasks.append(asyncio.create_task(self._update_context_periodically()))
-        
-        # Planifier les vérifications périodiques
-        self.tasks.append(asyncio.create_task(self._schedule_periodic_checks()))
-        
+
+        # Planifier les vérifications périodiques (TimerHandle sur la boucle,
+        # pas de tâche dédiée)
+        self._schedule_periodic_checks()
+
         logger.info("Moteur de recommandations démarré")
     
     async def stop(self):
@@ -90,28 +221,23 @@ class RecommendationEngine:
         
         logger.info("Arrêt du moteur de recommandations")
         self.running = False
-        
-        # Annuler toutes les tâches en cours
+
+        # Désarmer le réveil des vérifications planifiées
+        if self._check_handle is not None:
+            self._check_handle.cancel()
+            self._check_handle = None
+        self._check_heap = []
+
+        # Annuler toutes les tâches d'un bloc puis les collecter en une seule
+        # passe : l'arrêt dure le temps de la tâche la plus lente à se
+        # terminer au lieu de la somme des annulations séquentielles
         for task in self.tasks:
             if not task.done():
                 task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-        
-        # Annuler les tâches planifiées
-        for task_name, task in self.scheduled_tasks.items():
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-        
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
         self.tasks = []
-        self.scheduled_tasks = {}
-        
+
         logger.info("Moteur de recommandations arrêté")
     
     async def _update_context_periodically(self):
@@ -122,9 +248,16 @@ class RecommendationEngine:
             try:
                 # Mettre à jour le contexte
                 now = datetime.now()
-                
-                # Définir la période de la journée
                 hour = now.hour
+
+                # Tick sans rien à faire : pas d'activité arrivée depuis le
+                # dernier passage et période de la journée inchangée
+                if hour == self._last_hour_bucket and not self._activities_dirty:
+                    await asyncio.sleep(300)
+                    continue
+                self._last_hour_bucket = hour
+
+                # Définir la période de la journée
                 if 5 <= hour < 12:
                     self.current_context['time_of_day'] = 'morning'
                 elif 12 <= hour < 14:
@@ -136,13 +269,16 @@ class RecommendationEngine:
                 else:
                     self.current_context['time_of_day'] = 'night'
                 
-                # Nettoyer les activités trop anciennes (> 24h)
-                cutoff_time = now - timedelta(hours=24)
-                self.current_context['activities'] = [
-                    activity for activity in self.current_context['activities']
-                    if datetime.fromisoformat(activity.get('timestamp', now.isoformat())) > cutoff_time
-                ]
-                
+                # Nettoyer les activités trop anciennes (> 24h). Le timestamp
+                # epoch mis en cache à l'insertion évite de re-analyser la
+                # chaîne ISO de chaque activité, et la deque ordonnée permet
+                # de n'évincer que les entrées expirées en tête
+                cutoff = now.timestamp() - 86400
+                activities = self.current_context['activities']
+                while activities and activities[0]['_ts'] <= cutoff:
+                    activities.popleft()
+                self._activities_dirty = False
+
                 # Attendre avant la prochaine mise à jour (toutes les 5 minutes)
                 await asyncio.sleep(300)
             
@@ -153,88 +289,71 @@ class RecommendationEngine:
                 logger.error(f"Erreur lors de la mise à jour du contexte: {e}")
                 await asyncio.sleep(60)  # Attendre 1 minute en cas d'erreur
     
-    async def _schedule_periodic_checks(self):
+    def _schedule_periodic_checks(self):
         """
-        Planifie les vérifications périodiques pour les différentes recommandations
+        Planifie les vérifications périodiques pour les différentes recommandations.
+
+        Un unique tas ordonné par prochaine échéance remplace une tâche
+        asyncio par créneau horaire, et le réveil est confié à un TimerHandle
+        de la boucle (loop.call_at) plutôt qu'à une tâche suspendue dans un
+        asyncio.sleep de près de 24 h : aucune tâche vivante entre deux
+        échéances, et l'annulation est immédiate via handle.cancel().
         """
-        try:
-            # Planifier les vérifications de médicaments
-            for med_time_str in self.settings.medication_times:
-                med_hour, med_minute = map(int, med_time_str.split(':'))
-                self._schedule_daily_task(
-                    f"medication_{med_time_str}",
-                    time(med_hour, med_minute),
-                    self._check_medication_time
-                )
-            
-            # Planifier les vérifications de repas
-            for meal_time_str in self.settings.meal_times:
-                meal_hour, meal_minute = map(int, meal_time_str.split(':'))
-                self._schedule_daily_task(
-                    f"meal_{meal_time_str}",
-                    time(meal_hour, meal_minute),
-                    self._check_meal_time
-                )
-            
-            # Planifier les vérifications météo
-            for weather_time_str in self.settings.weather_check_times:
-                weather_hour, weather_minute = map(int, weather_time_str.split(':'))
-                self._schedule_daily_task(
-                    f"weather_{weather_time_str}",
-                    time(weather_hour, weather_minute),
-                    self._check_weather_conditions
-                )
-            
-            # Attendre indéfiniment (les tâches sont planifiées de manière asynchrone)
-            while self.running:
-                await asyncio.sleep(60)  # Vérifier périodiquement si nous devons nous arrêter
-        
-        except asyncio.CancelledError:
-            logger.info("Planification des vérifications annulée")
-        except Exception as e:
-            logger.error(f"Erreur lors de la planification des vérifications: {e}")
-    
-    def _schedule_daily_task(self, task_name: str, target_time: time, callback: callable):
+        # Construire le tas (échéance epoch, nom, rappel) à partir des
+        # horaires pré-analysés. Les échéances déjà passées aujourd'hui
+        # sont reportées à demain
+        self._check_heap = []
+        now = datetime.now()
+        slot_groups = [
+            ('medication', self._med_times, self._check_medication_time),
+            ('meal', self._meal_times, self._check_meal_time),
+            ('weather', self._weather_times, self._check_weather_conditions),
+        ]
+        for prefix, slots, callback in slot_groups:
+            for time_str, slot_time in slots:
+                target = datetime.combine(now.date(), slot_time)
+                if target < now:
+                    target = datetime.combine(now.date() + timedelta(days=1), slot_time)
+                heapq.heappush(self._check_heap, (target.timestamp(), f"{prefix}_{time_str}", callback))
+
+        self._arm_next_check()
+
+    def _arm_next_check(self):
+        """Programme le réveil de la boucle sur la prochaine échéance du tas"""
+        if not self.running or not self._check_heap:
+            return
+
+        fire_ts = self._check_heap[0][0]
+        delay = max(fire_ts - time_module.time(), 0)
+        logger.debug(f"Tâche {self._check_heap[0][1]} planifiée dans {delay:.0f} secondes")
+
+        loop = asyncio.get_running_loop()
+        self._check_handle = loop.call_at(
+            loop.time() + delay,
+            lambda: asyncio.ensure_future(self._run_due_checks())
+        )
+
+    async def _run_due_checks(self):
         """
-        Planifie une tâche quotidienne à une heure précise
-        
-        Args:
-            task_name (str): Nom de la tâche (pour le suivi)
-            target_time (time): Heure d'exécution
-            callback (callable): Fonction à appeler
+        Exécute les vérifications arrivées à échéance puis réarme le réveil
         """
-        async def _schedule_and_run():
-            while self.running:
-                now = datetime.now()
-                target = datetime.combine(now.date(), target_time)
-                
-                # Si l'heure cible est déjà passée aujourd'hui, programmer pour demain
-                if target < now:
-                    target = datetime.combine(now.date() + timedelta(days=1), target_time)
-                
-                # Calculer le délai d'attente
-                wait_seconds = (target - now).total_seconds()
-                logger.debug(f"Tâche {task_name} planifiée dans {wait_seconds} secondes")
-                
-                # Attendre jusqu'à l'heure cible
-                await asyncio.sleep(wait_seconds)
-                
-                if not self.running:
-                    break
-                
-                # Exécuter la tâche
+        try:
+            now_ts = time_module.time()
+            while self._check_heap and self._check_heap[0][0] <= now_ts:
+                fire_ts, task_name, callback = self._check_heap[0]
+                # Reprogrammer le créneau au lendemain avant de l'exécuter
+                heapq.heapreplace(self._check_heap, (fire_ts + 86400, task_name, callback))
+
                 try:
                     await callback()
+                    await self._flush_pending()
                     logger.info(f"Tâche {task_name} exécutée avec succès")
                 except Exception as e:
                     logger.error(f"Erreur lors de l'exécution de la tâche {task_name}: {e}")
-                
-                # Attendre un peu avant de reprogrammer (pour éviter les exécutions multiples)
-                await asyncio.sleep(60)
-        
-        # Créer et stocker la tâche
-        task = asyncio.create_task(_schedule_and_run())
-        self.scheduled_tasks[task_name] = task
+
+            self._arm_next_check()
+        except asyncio.CancelledError:
+            logger.info("Planification des vérifications annulée")
     
     async def _handle_user_activity(self, event: Event):
         """
@@ -243,27 +362,52 @@ class RecommendationEngine:
         Args:
             event (Event): Événement d'activité
         """
-        activity = event.data
-        
-        # Ajouter l'activité au contexte
+        # Copie systématique : event.data peut être un mapping paresseux en
+        # lecture seule (cf. LazyJson côté connecteur), et même quand c'est
+        # déjà un dict il est partagé avec l'historique du gestionnaire
+        # d'événements — les annotations privées (_ts, _type_lc, ...) ne
+        # doivent pas fuir dans les événements servis par l'API
+        activity = dict(event.data)
+
+        # Analyser le timestamp ISO une seule fois à l'insertion et mettre en
+        # cache l'epoch correspondant : les nettoyages et vérifications
+        # d'inactivité comparent ensuite des flottants au lieu de re-analyser
+        # la chaîne de chaque activité
+        if 'timestamp' in activity:
+            try:
+                activity['_ts'] = datetime.fromisoformat(activity['timestamp']).timestamp()
+            except (TypeError, ValueError):
+                activity['_ts'] = time_module.time()
+        else:
+            activity['_ts'] = time_module.time()
+
+        # Ajouter l'activité au contexte et marquer le ménage périodique
+        # comme ayant du travail
         self.current_context['activities'].append(activity)
-        
-        # Analyser l'activité pour détecter des contextes spécifiques
-        activity_type = activity.get('activity_type', '').lower()
-        description = activity.get('description', '').lower()
-        
-        # Détecter les repas
+        self._activities_dirty = True
+        
+        # Analyser l'activité pour détecter des contextes spécifiques. Les
+        # chaînes sont mises en minuscules une seule fois et conservées sur
+        # l'activité : les vérifications ultérieures réutilisent ces formes
+        # au lieu de rappeler .lower() à chaque passage
+        activity_type = activity['_type_lc'] = activity.get('activity_type', '').lower()
+        description = activity['_desc_lc'] = activity.get('description', '').lower()
+
+        # Détecter les repas. L'epoch déjà calculé pour l'activité sert de
+        # marqueur : les _check_* comparent des flottants au lieu de
+        # re-analyser une chaîne ISO aussitôt formatée
         if 'eating' in activity_type or 'meal' in activity_type or 'food' in description:
-            self.current_context['last_meal'] = activity.get('timestamp', datetime.now().isoformat())
+            self.current_context['last_meal'] = activity['_ts']
             logger.debug(f"Repas détecté: {description}")
-        
+
         # Détecter la prise de médicaments
         if 'medication' in activity_type or 'pill' in activity_type or 'medicine' in description:
-            self.current_context['last_medication'] = activity.get('timestamp', datetime.now().isoformat())
+            self.current_context['last_medication'] = activity['_ts']
             logger.debug(f"Prise de médicament détectée: {description}")
         
         # Analyser l'activité pour des recommandations contextuelles
         await self._check_activity_based_recommendations(activity)
+        await self._flush_pending()
     
     async def _handle_weather_update(self, event: Event):
         """
@@ -279,61 +423,79 @@ class RecommendationEngine:
         
         # Analyser les données météo pour des recommandations éventuelles
         await self._check_weather_based_recommendations(weather_data)
+        await self._flush_pending()
     
     async def _handle_high_priority(self, event: Event):
         """
         Traite un événement de haute priorité
-        
+
+        Le type d'événement est résolu par la table de répartition construite
+        dans __init__ : une recherche de dictionnaire et un appel, quel que
+        soit le nombre de types gérés.
+
         Args:
             event (Event): Événement haute priorité
         """
-        # Pour les événements de haute priorité, créer une recommandation immédiate
-        if event.event_type == EventType.WHATSAPP_CALL:
-            caller = event.data.get('caller', 'Quelqu\'un')
-            await self._create_recommendation(
-                'communication',
-                f"Appel WhatsApp de {caller}",
-                EventPriority.HIGH,
-                {'event_id': event.id, 'caller': caller}
-            )
-        
-        elif event.event_type == EventType.PHONE_CALL:
-            caller = event.data.get('caller', 'Quelqu\'un')
-            await self._create_recommendation(
-                'communication',
-                f"Appel téléphonique de {caller}",
-                EventPriority.HIGH,
-                {'event_id': event.id, 'caller': caller}
-            )
-        
-        elif event.event_type == EventType.SMS_RECEIVED and event.data.get('urgent', False):
-            sender = event.data.get('sender', 'Quelqu\'un')
-            await self._create_recommendation(
-                'communication',
-                f"SMS urgent de {sender}",
-                EventPriority.HIGH,
-                {'event_id': event.id, 'sender': sender, 'message': event.data.get('message', '')}
-            )
-        
-        elif event.event_type == EventType.EMAIL_RECEIVED and event.data.get('urgent', False):
-            sender = event.data.get('sender', 'Quelqu\'un')
-            await self._create_recommendation(
-                'communication',
-                f"Email urgent de {sender}",
-                EventPriority.HIGH,
-                {'event_id': event.id, 'sender': sender, 'subject': event.data.get('subject', '')}
-            )
-        
-        elif event.event_type == EventType.WEATHER_ALERT:
-            alert_type = event.data.get('alert_type', 'Alerte météo')
-            description = event.data.get('description', 'Conditions météorologiques importantes')
-            await self._create_recommendation(
-                'weather_alert',
-                f"{alert_type}: {description}",
-                event.priority,
-                {'event_id': event.id, 'alert_type': alert_type, 'description': description}
-            )
-    
+        handler = self._high_prio_handlers.get(event.event_type)
+        if handler is not None:
+            handler(event)
+            await self._flush_pending()
+
+    def _on_whatsapp_call(self, event: Event):
+        """Recommandation immédiate pour un appel WhatsApp entrant"""
+        caller = event.data.get('caller', _UNKNOWN_CONTACT)
+        self._create_recommendation(
+            'communication',
+            f"Appel WhatsApp de {caller}",
+            EventPriority.HIGH,
+            {'event_id': event.id, 'caller': caller}
+        )
+
+    def _on_phone_call(self, event: Event):
+        """Recommandation immédiate pour un appel téléphonique entrant"""
+        caller = event.data.get('caller', _UNKNOWN_CONTACT)
+        self._create_recommendation(
+            'communication',
+            f"Appel téléphonique de {caller}",
+            EventPriority.HIGH,
+            {'event_id': event.id, 'caller': caller}
+        )
+
+    def _on_sms_received(self, event: Event):
+        """Recommandation immédiate pour un SMS urgent"""
+        if not event.data.get('urgent', False):
+            return
+        sender = event.data.get('sender', _UNKNOWN_CONTACT)
+        self._create_recommendation(
+            'communication',
+            f"SMS urgent de {sender}",
+            EventPriority.HIGH,
+            {'event_id': event.id, 'sender': sender, 'message': event.data.get('message', '')}
+        )
+
+    def _on_email_received(self, event: Event):
+        """Recommandation immédiate pour un email urgent"""
+        if not event.data.get('urgent', False):
+            return
+        sender = event.data.get('sender', _UNKNOWN_CONTACT)
+        self._create_recommendation(
+            'communication',
+            f"Email urgent de {sender}",
+            EventPriority.HIGH,
+            {'event_id': event.id, 'sender': sender, 'subject': event.data.get('subject', '')}
+        )
+
+    def _on_weather_alert(self, event: Event):
+        """Recommandation immédiate pour une alerte météo"""
+        alert_type = event.data.get('alert_type', 'Alerte météo')
+        description = event.data.get('description', 'Conditions météorologiques importantes')
+        self._create_recommendation(
+            'weather_alert',
+            f"{alert_type}: {description}",
+            event.priority,
+            {'event_id': event.id, 'alert_type': alert_type, 'description': description}
+        )
+
     async def _check_medication_time(self):
         """
         Vérifie s'il est temps de rappeler la prise de médicament
@@ -342,31 +504,27 @@ class RecommendationEngine:
         now_str = now.strftime('%H:%M')
         
         # Vérifier si la prise de médicament a déjà été effectuée récemment
-        if self.current_context['last_medication']:
-            last_med_time = datetime.fromisoformat(self.current_context['last_medication'])
-            elapsed = now - last_med_time
-            
+        last_medication = self.current_context['last_medication']
+        if last_medication:
+            elapsed_sec = now.timestamp() - last_medication
+
             # Si la dernière prise était il y a moins de 30 minutes, ne pas rappeler
-            if elapsed < timedelta(minutes=30):
-                logger.debug(f"Prise de médicament récente ({elapsed.total_seconds() / 60:.0f} min), pas de rappel")
+            if elapsed_sec < 1800:
+                logger.debug(f"Prise de médicament récente ({elapsed_sec / 60:.0f} min), pas de rappel")
                 return
         
-        # Vérifier si nous sommes dans une période de repas
-        for med_time in self.settings.medication_times:
-            med_hour, med_minute = map(int, med_time.split(':'))
-            med_datetime = datetime.combine(now.date(), time(med_hour, med_minute))
-            
-            # Si nous sommes dans les 30 minutes avant ou après l'heure prévue
-            if abs((now - med_datetime).total_seconds()) < 1800:  # 30 minutes
-                # Vérifier si nous avons déjà envoyé une recommandation récemment
-                if self._can_send_recommendation('medication'):
-                    await self._create_recommendation(
-                        'medication',
-                        f"N'oubliez pas de prendre vos médicaments",
-                        EventPriority.MEDIUM,
-                        {'time': med_time}
-                    )
-                break
+        # Sommes-nous dans la fenêtre de ±30 minutes d'un créneau ? Une seule
+        # recherche dans l'index par minute
+        slot = self._med_slot_by_minute.get(now.hour * 60 + now.minute)
+        if slot is not None:
+            # Vérifier si nous avons déjà envoyé une recommandation récemment
+            if self._can_send_recommendation('medication'):
+                self._create_recommendation(
+                    'medication',
+                    f"N'oubliez pas de prendre vos médicaments",
+                    EventPriority.MEDIUM,
+                    {'time': slot[0]}
+                )
     
     async def _check_meal_time(self):
         """
@@ -376,42 +534,39 @@ class RecommendationEngine:
         now_str = now.strftime('%H:%M')
         
         # Vérifier si un repas a déjà été pris récemment
-        if self.current_context['last_meal']:
-            last_meal_time = datetime.fromisoformat(self.current_context['last_meal'])
-            elapsed = now - last_meal_time
-            
+        last_meal = self.current_context['last_meal']
+        if last_meal:
+            elapsed_sec = now.timestamp() - last_meal
+
             # Si le dernier repas était il y a moins d'une heure, ne pas rappeler
-            if elapsed < timedelta(hours=1):
-                logger.debug(f"Repas récent ({elapsed.total_seconds() / 3600:.1f}h), pas de rappel")
+            if elapsed_sec < 3600:
+                logger.debug(f"Repas récent ({elapsed_sec / 3600:.1f}h), pas de rappel")
                 return
         
-        # Vérifier si nous sommes dans une période de repas
-        for meal_time in self.settings.meal_times:
-            meal_hour, meal_minute = map(int, meal_time.split(':'))
-            meal_datetime = datetime.combine(now.date(), time(meal_hour, meal_minute))
-            
-            # Si nous sommes dans les 30 minutes avant ou après l'heure prévue
-            if abs((now - meal_datetime).total_seconds()) < 1800:  # 30 minutes
-                # Vérifier si la personne est inactive (pour ne pas interrompre une activité importante)
-                is_inactive = self._check_inactivity(timedelta(minutes=15))
-                
-                if is_inactive and self._can_send_recommendation('meal'):
-                    # Déterminer le type de repas en fonction de l'heure
-                    meal_type = "repas"
-                    if 6 <= meal_hour < 10:
-                        meal_type = "petit-déjeuner"
-                    elif 11 <= meal_hour < 14:
-                        meal_type = "déjeuner"
-                    elif 18 <= meal_hour < 21:
-                        meal_type = "dîner"
-                    
-                    await self._create_recommendation(
-                        'meal',
-                        f"Il est temps de préparer votre {meal_type}",
-                        EventPriority.MEDIUM,
-                        {'time': meal_time, 'meal_type': meal_type}
-                    )
-                break
+        # Sommes-nous dans la fenêtre de ±30 minutes d'un créneau de repas ?
+        slot = self._meal_slot_by_minute.get(now.hour * 60 + now.minute)
+        if slot is not None:
+            meal_time_str, meal_time = slot
+
+            # Vérifier si la personne est inactive (pour ne pas interrompre une activité importante)
+            is_inactive = self._check_inactivity(timedelta(minutes=15))
+
+            if is_inactive and self._can_send_recommendation('meal'):
+                # Déterminer le type de repas en fonction de l'heure
+                meal_type = "repas"
+                if 6 <= meal_time.hour < 10:
+                    meal_type = "petit-déjeuner"
+                elif 11 <= meal_time.hour < 14:
+                    meal_type = "déjeuner"
+                elif 18 <= meal_time.hour < 21:
+                    meal_type = "dîner"
+
+                self._create_recommendation(
+                    'meal',
+                    f"Il est temps de préparer votre {meal_type}",
+                    EventPriority.MEDIUM,
+                    {'time': meal_time_str, 'meal_type': meal_type}
+                )
     
     async def _check_weather_conditions(self):
         """
@@ -428,36 +583,24 @@ class RecommendationEngine:
         weather = self.current_context['weather']
         status = weather.get('detailed_status', '').lower()
         temp = weather.get('temperature', {}).get('temp', 20)  # Température par défaut: 20°C
-        
-        # Recommandations basées sur la météo
-        if 'rain' in status or 'shower' in status:
-            await self._create_recommendation(
-                'weather',
-                f"Il pleut actuellement. N'oubliez pas votre parapluie si vous sortez.",
-                EventPriority.MEDIUM,
-                {'weather': weather}
-            )
-        
-        elif 'snow' in status:
-            await self._create_recommendation(
-                'weather',
-                f"Il neige actuellement. Habillez-vous chaudement si vous sortez.",
-                EventPriority.MEDIUM,
-                {'weather': weather}
-            )
-        
-        elif temp < 5:
-            await self._create_recommendation(
-                'weather',
-                f"Il fait très froid actuellement ({temp:.1f}°C). Habillez-vous chaudement si vous sortez.",
-                EventPriority.MEDIUM,
-                {'weather': weather}
-            )
-        
-        elif temp > 30:
-            await self._create_recommendation(
+
+        # Recommandations basées sur la météo : les tables de déclencheurs
+        # remplacent la cascade de branches, un seul site d'appel
+        message = None
+        for keyword, msg in _WEATHER_STATUS_TRIGGERS:
+            if keyword in status:
+                message = msg
+                break
+        else:
+            for predicate, template in _WEATHER_TEMP_TRIGGERS:
+                if predicate(temp):
+                    message = template.format(temp=temp)
+                    break
+
+        if message is not None:
+            self._create_recommendation(
                 'weather',
-                f"Il fait très chaud actuellement ({temp:.1f}°C). Pensez à bien vous hydrater.",
+                message,
                 EventPriority.MEDIUM,
                 {'weather': weather}
             )
@@ -469,27 +612,25 @@ class RecommendationEngine:
         Args:
             activity (Dict[str, Any]): Activité détectée
         """
-        activity_type = activity.get('activity_type', '').lower()
-        description = activity.get('description', '').lower()
-        
+        # Formes minuscules mises en cache à l'insertion par
+        # _handle_user_activity
+        activity_type = activity['_type_lc']
+
         # Si l'utilisateur mange, rappeler les médicaments si c'est l'heure
         if ('eating' in activity_type or 'meal' in activity_type) and self._can_send_recommendation('medication_with_meal'):
             now = datetime.now()
-            
-            # Vérifier si une prise de médicament est prévue autour de cette heure
-            for med_time in self.settings.medication_times:
-                med_hour, med_minute = map(int, med_time.split(':'))
-                med_datetime = datetime.combine(now.date(), time(med_hour, med_minute))
-                
-                # Si nous sommes dans les 60 minutes avant ou après l'heure prévue
-                if abs((now - med_datetime).total_seconds()) < 3600:  # 60 minutes
-                    await self._create_recommendation(
-                        'medication_with_meal',
-                        f"Pendant que vous mangez, n'oubliez pas de prendre vos médicaments",
-                        EventPriority.MEDIUM,
-                        {'time': med_time}
-                    )
-                    break
+
+            # Une prise de médicament est-elle prévue dans les 60 minutes
+            # autour de cette heure ? Recherche O(1) dans l'index par minute,
+            # exécutée à chaque activité utilisateur
+            slot = self._med_meal_slot_by_minute.get(now.hour * 60 + now.minute)
+            if slot is not None:
+                self._create_recommendation(
+                    'medication_with_meal',
+                    f"Pendant que vous mangez, n'oubliez pas de prendre vos médicaments",
+                    EventPriority.MEDIUM,
+                    {'time': slot[0]}
+                )
         
         # Si l'utilisateur est inactif pendant longtemps, suggérer une activité
         elif 'idle' in activity_type and self._can_send_recommendation('activity_suggestion'):
@@ -500,7 +641,7 @@ class RecommendationEngine:
                 temp = weather.get('temperature', {}).get('temp', 20)
                 
                 if ('clear' in status or 'sun' in status) and 15 <= temp <= 25:
-                    await self._create_recommendation(
+                    self._create_recommendation(
                         'activity_suggestion',
                         f"Il fait beau dehors ({temp:.1f}°C). C'est peut-être le moment idéal pour une promenade ?",
                         EventPriority.LOW,
@@ -508,15 +649,8 @@ class RecommendationEngine:
                     )
                 else:
                     # Activité intérieure
-                    indoor_activities = [
-                        "lire un livre",
-                        "regarder un film",
-                        "cuisiner quelque chose de nouveau",
-                        "appeler un ami",
-                        "faire un peu de rangement"
-                    ]
-                    suggestion = random.choice(indoor_activities)
-                    await self._create_recommendation(
+                    suggestion = random.choice(_INDOOR_ACTIVITIES)
+                    self._create_recommendation(
                         'activity_suggestion',
                         f"Vous êtes inactif depuis un moment. Que diriez-vous de {suggestion} ?",
                         EventPriority.LOW,
@@ -534,11 +668,15 @@ class RecommendationEngine:
         # Les recommandations régulières sont gérées par _check_weather_conditions
         pass
     
-    async def _create_recommendation(self, rec_type: str, message: str, priority: EventPriority, 
-                                   metadata: Optional[Dict[str, Any]] = None):
+    def _create_recommendation(self, rec_type: str, message: str, priority: EventPriority,
+                               metadata: Optional[Dict[str, Any]] = None):
         """
-        Crée et envoie une recommandation
-        
+        Crée une recommandation et la met en file d'attente
+
+        L'événement n'est pas publié immédiatement : il rejoint les
+        recommandations du même réveil et part en un seul appel groupé via
+        _flush_pending, ce qui évite une suspension de boucle par événement.
+
         Args:
             rec_type (str): Type de recommandation
             message (str): Message de la recommandation
@@ -556,14 +694,21 @@ class RecommendationEngine:
                 'metadata': metadata or {}
             }
         )
-        
-        # Publier l'événement
-        await self.event_manager.publish(event)
-        
-        # Mettre à jour le suivi des recommandations
-        self.current_context['last_recommendations'][rec_type] = datetime.now().isoformat()
-        
+
+        self._pending_events.append(event)
+
+        # Mettre à jour le suivi des recommandations. Instant monotone brut :
+        # comparaison de flottants côté _can_send_recommendation, insensible
+        # aux changements d'heure système
+        self.current_context['last_recommendations'][rec_type] = time_module.monotonic()
+
         logger.info(f"Recommandation créée: {rec_type} - {message}")
+
+    async def _flush_pending(self):
+        """Publie en une seule passe les recommandations accumulées"""
+        if self._pending_events:
+            events, self._pending_events = self._pending_events, []
+            await self.event_manager.publish_many(events)
     
     def _can_send_recommendation(self, rec_type: str) -> bool:
         """
@@ -575,20 +720,14 @@ class RecommendationEngine:
         Returns:
             bool: True si la recommandation peut être envoyée, False sinon
         """
-        # Vérifier si nous avons déjà envoyé une recommandation de ce type récemment
-        if rec_type in self.current_context['last_recommendations']:
-            last_time_str = self.current_context['last_recommendations'][rec_type]
-            last_time = datetime.fromisoformat(last_time_str)
-            now = datetime.now()
-            
-            # Obtenir l'intervalle minimum pour ce type (ou utiliser 30 minutes par défaut)
-            min_interval = self.recommendation_intervals.get(rec_type, 30)
-            
-            # Vérifier si assez de temps s'est écoulé
-            if (now - last_time) < timedelta(minutes=min_interval):
-                logger.debug(f"Recommandation {rec_type} envoyée récemment, attente de {min_interval} minutes")
-                return False
-        
+        # Une seule recherche de dictionnaire grâce à la sentinelle : simple
+        # soustraction d'instants monotones contre l'intervalle minimum
+        # précalculé en secondes (30 minutes par défaut)
+        last = self.current_context['last_recommendations'].get(rec_type, _NEVER_SENT)
+        if (time_module.monotonic() - last) < self._intervals_sec.get(rec_type, 1800.0):
+            logger.debug(f"Recommandation {rec_type} envoyée récemment, pas de renvoi")
+            return False
+
         return True
     
     def _check_inactivity(self, duration: timedelta) -> bool:
@@ -603,15 +742,10 @@ class RecommendationEngine:
         """
         if not self.current_context['activities']:
             return True
-        
-        # Trouver l'activité la plus récente
-        now = datetime.now()
-        latest_activity = max(
-            self.current_context['activities'],
-            key=lambda a: datetime.fromisoformat(a.get('timestamp', '2000-01-01T00:00:00'))
-        )
-        
-        latest_time = datetime.fromisoformat(latest_activity.get('timestamp', now.isoformat()))
-        elapsed = now - latest_time
-        
-        return elapsed > duration
+
+        # La deque étant ordonnée par insertion, la dernière entrée est la
+        # plus récente : lecture directe de son epoch mis en cache
+        latest_ts = self.current_context['activities'][-1]['_ts']
+        elapsed = time_module.time() - latest_ts
+
+        return elapsed > duration.total_seconds()
@@ -8,11 +8,13 @@ Permet aux différents composants de publier et de s'abonner à des événements
 
 import asyncio
 import logging
+import threading
 from typing import Dict, Callable, List, Set, Any, Coroutine, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 
-from events.event_types import Event, EventType, EventPriority
+from events.event_types import (Event, EventType, EventPriority,
+                                EVENT_TYPE_NAMES, EVENT_PRIORITY_NAMES)
 
 logger = logging.getLogger("angel.events")
 
@@ -30,20 +32,38 @@ class EventManager:
             max_history (int, optional): Nombre maximum d'événements à conserver dans l'historique.
                 Defaults to 100.
         """
-        # Callbacks par type d'événement
-        self._subscribers: Dict[EventType, List[Callable]] = defaultdict(list)
+        # Abonnés par type et par priorité : dict simple -> tuple figé. Le
+        # tuple n'est reconstruit qu'à l'abonnement/désabonnement (rare), le
+        # dispatch itère une structure immuable via un seul .get(), et aucun
+        # defaultdict n'autovivifie de liste pour les types jamais abonnés
+        self._subscribers: Dict[EventType, tuple] = {}
+        self._priority_subscribers: Dict[EventPriority, tuple] = {}
         
-        # Callbacks par priorité d'événement
-        self._priority_subscribers: Dict[EventPriority, List[Callable]] = defaultdict(list)
-        
-        # Historique des événements
+        # Historique des événements : anneau principal borné, plus des anneaux
+        # miroirs par type et par priorité pour des lectures filtrées en
+        # O(limit) au lieu d'un balayage linéaire complet
+        self._max_history = max_history
         self._history = deque(maxlen=max_history)
+        self._history_by_type: Dict[EventType, deque] = defaultdict(
+            lambda: deque(maxlen=self._max_history))
+        self._history_by_priority: Dict[EventPriority, deque] = defaultdict(
+            lambda: deque(maxlen=self._max_history))
         
         # État du gestionnaire
         self._running = False
-        
-        # File d'attente d'événements
-        self._queue = asyncio.Queue()
+
+        # File d'attente d'événements : deque alimentée par les éditeurs et
+        # drainée par le processeur, avec un unique Event de réveil. Aucun
+        # Future par dépôt contrairement à asyncio.Queue, et le processeur
+        # dort réellement tant que la file est vide
+        self._pending: deque = deque()
+        self._wake = asyncio.Event()
+
+        # Boucle du processeur et identifiant de son thread, mémorisés au
+        # démarrage : publish_sync distingue ainsi l'appel depuis le thread
+        # de la boucle (réveil direct) de l'appel inter-threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
         
         # Éventuelles tâches de traitement
         self._tasks = []
@@ -57,6 +77,8 @@ class EventManager:
             return
         
         self._running = True
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
         self._tasks.append(asyncio.create_task(self._event_processor()))
         logger.info("Gestionnaire d'événements démarré")
     
@@ -67,7 +89,10 @@ class EventManager:
             return
         
         self._running = False
-        
+
+        # Réveiller le processeur s'il dort sur la file vide, puis annuler
+        self._wake.set()
+
         # Annuler toutes les tâches en cours
         for task in self._tasks:
             if not task.done():
@@ -76,8 +101,10 @@ class EventManager:
                     await task
                 except asyncio.CancelledError:
                     pass
-        
+
         self._tasks = []
+        self._loop = None
+        self._loop_thread_id = None
         logger.info("Gestionnaire d'événements arrêté")
     
     def subscribe(self, event_type: EventType, callback: Callable[[Event], Any]) -> None:
@@ -88,7 +115,7 @@ class EventManager:
             event_type (EventType): Type d'événement auquel s'abonner
             callback (Callable[[Event], Any]): Fonction à appeler lorsque l'événement se produit
         """
-        self._subscribers[event_type].append(callback)
+        self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (callback,)
         logger.debug(f"Abonnement au type d'événement: {event_type.name}")
     
     def subscribe_to_priority(self, priority: EventPriority, callback: Callable[[Event], Any]) -> None:
@@ -99,7 +126,7 @@ class EventManager:
             priority (EventPriority): Priorité d'événements à laquelle s'abonner
             callback (Callable[[Event], Any]): Fonction à appeler lorsque l'événement se produit
         """
-        self._priority_subscribers[priority].append(callback)
+        self._priority_subscribers[priority] = self._priority_subscribers.get(priority, ()) + (callback,)
         logger.debug(f"Abonnement à la priorité d'événement: {priority.name}")
     
     def unsubscribe(self, event_type: EventType, callback: Callable[[Event], Any]) -> None:
@@ -110,12 +137,19 @@ class EventManager:
             event_type (EventType): Type d'événement dont se désabonner
             callback (Callable[[Event], Any]): Fonction à retirer des abonnés
         """
-        if event_type in self._subscribers:
-            try:
-                self._subscribers[event_type].remove(callback)
-                logger.debug(f"Désabonnement du type d'événement: {event_type.name}")
-            except ValueError:
-                logger.warning(f"Tentative de désabonnement d'une fonction non abonnée pour {event_type.name}")
+        callbacks = list(self._subscribers.get(event_type, ()))
+        try:
+            callbacks.remove(callback)
+        except ValueError:
+            logger.warning(f"Tentative de désabonnement d'une fonction non abonnée pour {event_type.name}")
+        else:
+            # Clé supprimée quand plus aucun abonné : le dispatch retombe
+            # sur le chemin rapide "pas d'abonnés"
+            if callbacks:
+                self._subscribers[event_type] = tuple(callbacks)
+            else:
+                del self._subscribers[event_type]
+            logger.debug(f"Désabonnement du type d'événement: {event_type.name}")
     
     def unsubscribe_from_priority(self, priority: EventPriority, callback: Callable[[Event], Any]) -> None:
         """
@@ -125,12 +159,17 @@ class EventManager:
             priority (EventPriority): Priorité d'événements dont se désabonner
             callback (Callable[[Event], Any]): Fonction à retirer des abonnés
         """
-        if priority in self._priority_subscribers:
-            try:
-                self._priority_subscribers[priority].remove(callback)
-                logger.debug(f"Désabonnement de la priorité d'événement: {priority.name}")
-            except ValueError:
-                logger.warning(f"Tentative de désabonnement d'une fonction non abonnée pour la priorité {priority.name}")
+        callbacks = list(self._priority_subscribers.get(priority, ()))
+        try:
+            callbacks.remove(callback)
+        except ValueError:
+            logger.warning(f"Tentative de désabonnement d'une fonction non abonnée pour la priorité {priority.name}")
+        else:
+            if callbacks:
+                self._priority_subscribers[priority] = tuple(callbacks)
+            else:
+                del self._priority_subscribers[priority]
+            logger.debug(f"Désabonnement de la priorité d'événement: {priority.name}")
     
     async def publish(self, event: Event) -> None:
         """
@@ -139,70 +178,159 @@ class EventManager:
         Args:
             event (Event): Événement à publier
         """
-        await self._queue.put(event)
-    
+        self._pending.append(event)
+        self._wake.set()
+
+    async def publish_many(self, events: List[Event]) -> None:
+        """
+        Publie une séquence d'événements en une seule passe
+
+        Les dépôts sont immédiats et le processeur n'est réveillé qu'une
+        seule fois pour tout le lot, contrairement à N appels successifs à
+        publish().
+
+        Args:
+            events (List[Event]): Événements à publier, dans l'ordre
+        """
+        self._pending.extend(events)
+        self._wake.set()
+
     def publish_sync(self, event: Event) -> None:
         """
         Publie un événement de manière synchrone (pour les contextes non-async)
-        
+
+        Nécessite que le gestionnaire soit démarré : l'ancien repli qui
+        créait une boucle jetable via asyncio.run coûtait des centaines de
+        microsecondes par appel et tournait de toute façon sans le processeur.
+
         Args:
             event (Event): Événement à publier
+
+        Raises:
+            RuntimeError: Si le gestionnaire n'a pas été démarré
         """
-        # Utiliser asyncio.run_coroutine_threadsafe si nous sommes dans un thread différent
-        # sinon, simplement mettre l'événement dans la file d'attente
-        try:
-            loop = asyncio.get_running_loop()
-            asyncio.run_coroutine_threadsafe(self._queue.put(event), loop)
-        except RuntimeError:
-            # Pas de boucle asyncio en cours d'exécution
-            # Créer une nouvelle boucle temporaire pour publier l'événement
-            async def _publish():
-                await self._queue.put(event)
-            
-            asyncio.run(_publish())
+        if self._loop is None:
+            raise RuntimeError("EventManager non démarré")
+
+        # Le dépôt dans la deque est atomique et valable depuis n'importe
+        # quel thread ; seul le réveil doit passer par la boucle du
+        # processeur quand l'appel vient d'un autre thread
+        self._pending.append(event)
+        if threading.get_ident() == self._loop_thread_id:
+            # Même thread que la boucle : réveil direct, sans passer par le
+            # self-pipe de call_soon_threadsafe (une comparaison d'entiers
+            # remplace aussi le try/except get_running_loop par appel)
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
     
     async def _event_processor(self) -> None:
         """
         Traite les événements dans la file d'attente et les distribue aux abonnés
         """
+        # Liaisons locales des globales et méthodes liées sollicitées à
+        # chaque événement : un LOAD_FAST remplace les LOAD_GLOBAL /
+        # recherches d'attributs répétées dans la boucle chaude. Les objets
+        # visés (deque, anneaux, instantanés) sont mutés en place et gardent
+        # la même identité pendant toute la vie du processeur
+        iscoroutine = asyncio.iscoroutine
+        log_error = logger.error
+        pending = self._pending
+        wake = self._wake
+        history_extend = self._history.extend
+        history_by_type = self._history_by_type
+        history_by_priority = self._history_by_priority
+        type_subscribers = self._subscribers
+        priority_subscribers = self._priority_subscribers
+
+        # Niveau DEBUG évalué une fois à l'entrée du processeur plutôt qu'à
+        # chaque événement : en production (DEBUG inactif) la trace par
+        # événement ne coûte plus qu'un test de booléen local. Un changement
+        # de niveau à chaud n'est pris en compte qu'au redémarrage du
+        # gestionnaire, compromis assumé
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
         while self._running:
             try:
-                # Attendre le prochain événement avec un timeout pour pouvoir vérifier
-                # régulièrement si nous devons continuer à fonctionner
-                try:
-                    event = await asyncio.wait_for(self._queue.get(), timeout=0.5)
-                except asyncio.TimeoutError:
-                    continue
-                
-                # Ajouter à l'historique
-                self._history.append(event)
-                
-                # Notifier les abonnés par type d'événement
-                if event.event_type in self._subscribers:
-                    for callback in self._subscribers[event.event_type]:
-                        try:
-                            result = callback(event)
-                            # Gérer les coroutines retournées
-                            if asyncio.iscoroutine(result):
-                                await result
-                        except Exception as e:
-                            logger.error(f"Erreur lors de l'exécution du callback pour {event.event_type.name}: {e}")
-                
-                # Notifier les abonnés par priorité
-                if event.priority in self._priority_subscribers:
-                    for callback in self._priority_subscribers[event.priority]:
-                        try:
-                            result = callback(event)
-                            # Gérer les coroutines retournées
-                            if asyncio.iscoroutine(result):
-                                await result
-                        except Exception as e:
-                            logger.error(f"Erreur lors de l'exécution du callback pour priorité {event.priority.name}: {e}")
-                
-                # Marquer l'événement comme traité
-                self._queue.task_done()
-                
-                logger.debug(f"Événement traité: {event.event_type.name} ({event.priority.name})")
+                # Dormir tant que la file est vide : aucun réveil périodique,
+                # le prochain publish positionne l'Event de réveil
+                await wake.wait()
+                wake.clear()
+
+                while pending:
+                    # Drainer la file par lots : une rafale (p. ex. 30
+                    # activités caméra en 100 ms) est distribuée sans repasser
+                    # par l'ordonnanceur entre chaque événement. Le lot est
+                    # borné pour ne pas monopoliser la boucle indéfiniment
+                    batch = []
+                    while pending and len(batch) < 64:
+                        batch.append(pending.popleft())
+
+                    # Anneau principal alimenté en un seul appel C
+                    history_extend(batch)
+
+                    # Coroutines accumulées sur tout le lot : un seul gather
+                    # par lot au lieu d'un par événement
+                    to_await = None
+                    await_names = None
+
+                    for event in batch:
+                        # Attributs résolus une seule fois par événement :
+                        # chaque accès event.event_type/priority repaie sinon
+                        # la recherche de descripteur à tous les points d'usage
+                        et = event.event_type
+                        pri = event.priority
+
+                        # Index miroirs de l'historique
+                        history_by_type[et].append(event)
+                        history_by_priority[pri].append(event)
+
+                        # Notifier les abonnés par type d'événement (tuple
+                        # figé : une seule recherche, itération sans risque de
+                        # mutation). Les rappels synchrones s'exécutent sur
+                        # place, les coroutines sont mises de côté
+                        callbacks = type_subscribers.get(et)
+                        if callbacks:
+                            for callback in callbacks:
+                                try:
+                                    result = callback(event)
+                                    if iscoroutine(result):
+                                        if to_await is None:
+                                            to_await = []
+                                            await_names = []
+                                        to_await.append(result)
+                                        await_names.append(EVENT_TYPE_NAMES[et])
+                                except Exception as e:
+                                    log_error(f"Erreur lors de l'exécution du callback pour {EVENT_TYPE_NAMES[et]}: {e}")
+
+                        # Notifier les abonnés par priorité
+                        callbacks = priority_subscribers.get(pri)
+                        if callbacks:
+                            for callback in callbacks:
+                                try:
+                                    result = callback(event)
+                                    if iscoroutine(result):
+                                        if to_await is None:
+                                            to_await = []
+                                            await_names = []
+                                        to_await.append(result)
+                                        await_names.append(EVENT_TYPE_NAMES[et])
+                                except Exception as e:
+                                    log_error(f"Erreur lors de l'exécution du callback pour priorité {EVENT_PRIORITY_NAMES[pri]}: {e}")
+
+                        # La trace n'est formatée que si DEBUG est actif
+                        if debug_enabled:
+                            logger.debug(f"Événement traité: {EVENT_TYPE_NAMES[et]} ({EVENT_PRIORITY_NAMES[pri]})")
+
+                    # Attendre toutes les coroutines du lot en parallèle : la
+                    # latence de dispatch devient celle du rappel le plus lent
+                    # au lieu de la somme des rappels. return_exceptions
+                    # préserve l'isolement des erreurs par rappel
+                    if to_await:
+                        results = await asyncio.gather(*to_await, return_exceptions=True)
+                        for name, exc in zip(await_names, results):
+                            if isinstance(exc, BaseException):
+                                log_error(f"Erreur lors de l'exécution d'un callback asynchrone pour {name}: {exc}")
             
             except asyncio.CancelledError:
                 logger.info("Traitement des événements annulé")
@@ -210,36 +338,65 @@ class EventManager:
             except Exception as e:
                 logger.error(f"Erreur dans le processeur d'événements: {e}")
     
-    def get_history(self, event_type: Optional[EventType] = None, 
+    def get_history(self, event_type: Optional[EventType] = None,
+                   priority: Optional[EventPriority] = None,
                    since: Optional[datetime] = None,
-                   limit: int = 50) -> List[Event]:
+                   limit: int = 50,
+                   as_dicts: bool = False) -> List[Any]:
         """
         Récupère l'historique des événements avec filtrage optionnel
-        
+
         Args:
             event_type (Optional[EventType], optional): Type d'événement à filtrer. Defaults to None.
+            priority (Optional[EventPriority], optional): Priorité à filtrer. Defaults to None.
             since (Optional[datetime], optional): Timestamp minimum. Defaults to None.
             limit (int, optional): Nombre maximum d'événements à retourner. Defaults to 50.
-            
+            as_dicts (bool, optional): Retourner des dictionnaires sérialisables
+                plutôt que des objets Event (évite une seconde boucle côté appelant).
+                Defaults to False.
+
         Returns:
-            List[Event]: Liste des événements correspondant aux critères
+            List[Any]: Liste des événements (ou dictionnaires) correspondant aux critères
         """
         result = []
         count = 0
-        
+
+        # Comparer en epoch flottant : les événements portent leur instant de
+        # création sous cette forme, inutile de matérialiser un datetime par
+        # événement parcouru
+        since_ts = since.timestamp() if since is not None else None
+
+        # Choisir le plus petit anneau applicable pour limiter le parcours
+        if event_type is not None and priority is not None:
+            by_type = self._history_by_type.get(event_type, ())
+            by_priority = self._history_by_priority.get(priority, ())
+            source = by_type if len(by_type) <= len(by_priority) else by_priority
+        elif event_type is not None:
+            source = self._history_by_type.get(event_type, ())
+        elif priority is not None:
+            source = self._history_by_priority.get(priority, ())
+        else:
+            source = self._history
+
         # Parcourir l'historique du plus récent au plus ancien
-        for event in reversed(self._history):
+        for event in reversed(source):
             # Appliquer les filtres
             if event_type is not None and event.event_type != event_type:
                 continue
-                
-            if since is not None and event.timestamp < since:
+
+            if priority is not None and event.priority != priority:
                 continue
-                
-            result.append(event)
+
+            # Les anneaux sont ordonnés chronologiquement : dès qu'un
+            # événement est antérieur à since, tous les suivants du parcours
+            # (plus anciens) le sont aussi
+            if since_ts is not None and event._created < since_ts:
+                break
+
+            result.append(event.to_dict() if as_dicts else event)
             count += 1
-            
+
             if count >= limit:
                 break
-                
+
         return result
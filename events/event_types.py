@@ -5,13 +5,27 @@
 Définition des types d'événements utilisés dans l'application.
 """
 
-from enum import Enum, auto
+import itertools
+import time
+
+from enum import IntEnum, auto
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
-class EventType(Enum):
-    """Types d'événements gérés par l'application"""
+# Compteur monotone partagé pour les identifiants d'événements : plus rapide
+# et plus sûr (pas de collision dans la même seconde) que l'epoch entier du
+# timestamp utilisé historiquement
+_id_counter = itertools.count(1)
+
+class EventType(IntEnum):
+    """
+    Types d'événements gérés par l'application
+
+    IntEnum plutôt qu'Enum : les membres héritent du hachage et de l'égalité
+    entiers au niveau C, ce qui accélère les recherches de dict que le
+    dispatcher effectue à chaque événement.
+    """
     # Événements de l'utilisateur et du système
     USER_ACTIVITY = auto()         # Activité détectée par angel-server-capture
     SYSTEM_STATUS = auto()         # État du système (démarrage, arrêt, etc.)
@@ -39,53 +53,110 @@ class EventType(Enum):
     CUSTOM = auto()                # Événement personnalisé
 
 
-class EventPriority(Enum):
-    """Priorités pour les événements"""
+class EventPriority(IntEnum):
+    """Priorités pour les événements (IntEnum : mêmes raisons qu'EventType)"""
     LOW = 0      # Basse priorité (suggestions, informations)
     MEDIUM = 1   # Priorité moyenne (rappels, recommandations)
     HIGH = 2     # Haute priorité (alertes, appels)
     CRITICAL = 3 # Priorité critique (urgences)
 
 
-@dataclass
+# Caches des noms de membres : enum .name passe par un descripteur
+# (DynamicClassAttribute) à chaque accès, une simple recherche de dict est
+# plus rapide sur les chemins de journalisation du dispatcher
+EVENT_TYPE_NAMES = {member: member.name for member in EventType}
+EVENT_PRIORITY_NAMES = {member: member.name for member in EventPriority}
+
+
+@dataclass(slots=True)
 class Event:
     """
-    Classe représentant un événement dans le système
+    Classe représentant un événement dans le système.
+
+    Les slots suppriment le __dict__ par instance : un événement coûte
+    sensiblement moins de mémoire, ce qui compte pour l'historique et les
+    rafales d'activités.
     """
     event_type: EventType
     priority: EventPriority
     source: str
-    timestamp: datetime = None
+    _timestamp: Optional[datetime] = field(default=None, repr=False, compare=False)
     data: Dict[str, Any] = None
-    id: str = None
-    
+    _id: Optional[str] = field(default=None, repr=False, compare=False)
+    _created: float = field(default=0.0, init=False, repr=False, compare=False)
+    _cached_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+
     def __post_init__(self):
         """Initialisation automatique des champs manquants"""
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
-        
+        # Instant de création en epoch flottant : time.time() coûte une
+        # fraction de datetime.now(), et suffit pour ordonner et filtrer les
+        # événements. Le datetime n'est construit que si quelqu'un le lit
+        # (voir la propriété timestamp)
+        if self._timestamp is not None:
+            self._created = self._timestamp.timestamp()
+        else:
+            self._created = time.time()
+
         if self.data is None:
             self.data = {}
-        
-        if self.id is None:
-            # Générer un ID unique basé sur le timestamp et le type
-            self.id = f"{self.event_type.name}_{int(self.timestamp.timestamp())}"
-    
+
+        # Cache de la représentation dictionnaire (un événement est immuable
+        # une fois créé, inutile de reconstruire le dict à chaque sérialisation)
+        self._cached_dict = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """
+        Horodatage de l'événement, matérialisé paresseusement
+
+        Même principe que l'identifiant : la conversion epoch -> datetime
+        n'est payée qu'au premier accès, typiquement à la sérialisation.
+
+        Returns:
+            datetime: Horodatage de l'événement
+        """
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created)
+        return self._timestamp
+
+    @property
+    def id(self) -> str:
+        """
+        Identifiant unique de l'événement, généré paresseusement
+
+        La génération (f-string + compteur) n'est payée qu'au premier accès :
+        les événements à fort débit dont personne ne lit l'identifiant n'en
+        paient jamais le coût.
+
+        Returns:
+            str: Identifiant unique de l'événement
+        """
+        if self._id is None:
+            self._id = f"{self.event_type.name}_{next(_id_counter)}"
+        return self._id
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convertit l'événement en dictionnaire pour la sérialisation
-        
+
         Returns:
             Dict[str, Any]: Représentation de l'événement sous forme de dictionnaire
         """
-        return {
-            "id": self.id,
-            "event_type": self.event_type.name,
-            "priority": self.priority.name,
-            "source": self.source,
-            "timestamp": self.timestamp.isoformat(),
-            "data": self.data
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "id": self.id,
+                "event_type": self.event_type.name,
+                "priority": self.priority.name,
+                "source": self.source,
+                # datetime brut : orjson le sérialise nativement, plus vite
+                # qu'un appel .isoformat() par événement
+                "timestamp": self.timestamp,
+                # data peut être un mapping paresseux (cf. LazyJson côté
+                # connecteur) : le matérialiser en dict pour la sérialisation
+                "data": self.data if type(self.data) is dict else dict(self.data)
+            }
+        return self._cached_dict
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Event':
@@ -98,13 +169,17 @@ class Event:
         Returns:
             Event: Instance de l'événement
         """
+        timestamp = data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+
         return cls(
             event_type=EventType[data["event_type"]],
             priority=EventPriority[data["priority"]],
             source=data["source"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            _timestamp=timestamp,
             data=data.get("data", {}),
-            id=data.get("id")
+            _id=data.get("id")
         )
 
 
@@ -30,14 +30,17 @@ def signal_handler(sig, frame):
     app_manager.stop()
     sys.exit(0)
 
-async def main():
-    """Fonction principale asynchrone"""
+async def main(settings: Settings):
+    """
+    Fonction principale asynchrone
+
+    Args:
+        settings (Settings): Configuration de l'application
+    """
     global app_manager
-    
-    # Charger les paramètres de configuration
-    settings = Settings()
+
     logger.info(f"Configuration chargée depuis {settings.config_file}")
-    
+
     # Créer et démarrer le gestionnaire d'application
     app_manager = AppManager(settings)
     
@@ -62,9 +65,27 @@ if __name__ == "__main__":
         # Créer le dossier de logs s'il n'existe pas
         import os
         os.makedirs("logs", exist_ok=True)
-        
-        # Démarrer la boucle asyncio
-        asyncio.run(main())
+
+        # Charger la configuration avant de choisir la boucle d'événements
+        settings = Settings()
+        settings.validate()
+
+        if settings.avatar_enabled:
+            # L'interface Qt doit vivre sur le thread principal : qasync fait
+            # tourner asyncio directement sur la boucle d'événements Qt, ce
+            # qui évite un thread UI dédié et tout marshalling inter-threads
+            import qasync
+            from PyQt6.QtWidgets import QApplication
+
+            qt_app = QApplication(sys.argv)
+            qt_app.setQuitOnLastWindowClosed(False)
+            loop = qasync.QEventLoop(qt_app)
+            asyncio.set_event_loop(loop)
+            with loop:
+                loop.run_until_complete(main(settings))
+        else:
+            # Pas d'avatar : boucle asyncio standard
+            asyncio.run(main(settings))
     except Exception as e:
         logger.exception(f"Erreur fatale: {e}")
         sys.exit(1)